@@ -96,8 +96,8 @@ AI_Project/
 - OSError handling for I2C communication
 
 ### src/telemetry.py (220 lines)
-- ValidatedReading: Validated sensor data model
-- TelemetryMessage: MQTT message format
+- ValidatedReading: Validated sensor data (slotted dataclass)
+- TelemetryMessage: MQTT message format (orjson serialization)
 - DataValidator: Range validation against rules
 - TelemetryNormalizer: Batching and enrichment
 - TelemetryProcessor: Combined validation + normalization
@@ -174,7 +174,7 @@ Production Dependencies:
 - smbus2==0.4.3                 # I2C communication
 - pyyaml==6.0.1                 # YAML configuration
 - pydantic==2.5.3               # Data validation
-- python-json-logger==2.0.7     # JSON logging
+- orjson==3.9.10                # Fast JSON serialization (telemetry, logs)
 - tenacity==8.2.3               # Retry/backoff logic
 
 Testing Dependencies:
@@ -7,6 +7,7 @@ Creates a mock environment for testing without real hardware
 import time
 import random
 from datetime import datetime
+from typing import Optional
 from src.sensor_interface import SensorInterface, SensorReading
 from src.telemetry import TelemetryProcessor
 from src.config import ValidationRules, TelemetryConfig
@@ -16,11 +17,20 @@ from src.logger import setup_logging
 class MockSensor(SensorInterface):
     """Mock sensor for testing without hardware"""
     
-    def __init__(self, name: str, unit: str, min_val: float, max_val: float):
+    def __init__(
+        self,
+        name: str,
+        unit: str,
+        min_val: float,
+        max_val: float,
+        rng: Optional[random.Random] = None
+    ):
         super().__init__(name)
         self.unit = unit
         self.min_val = min_val
         self.max_val = max_val
+        # Bind the generator's uniform() once instead of looking it up per read
+        self._uniform = (rng or random.Random()).uniform
     
     def connect(self) -> bool:
         self._connected = True
@@ -34,7 +44,7 @@ class MockSensor(SensorInterface):
             return None
         
         # Generate random value in range
-        value = random.uniform(self.min_val, self.max_val)
+        value = self._uniform(self.min_val, self.max_val)
         
         return SensorReading(
             sensor_name=self.name,
@@ -50,11 +60,12 @@ def main():
     # Setup logging
     logger = setup_logging(log_level="INFO", app_name="mock-demo")
     
-    # Create mock sensors
+    # Create mock sensors sharing one random generator
+    rng = random.Random()
     sensors = [
-        MockSensor("temperature_sensor", "celsius", 20.0, 30.0),
-        MockSensor("humidity_sensor", "percent", 40.0, 70.0),
-        MockSensor("pressure_sensor", "hPa", 1000.0, 1020.0),
+        MockSensor("temperature_sensor", "celsius", 20.0, 30.0, rng),
+        MockSensor("humidity_sensor", "percent", 40.0, 70.0, rng),
+        MockSensor("pressure_sensor", "hPa", 1000.0, 1020.0, rng),
     ]
     
     # Connect all sensors
@@ -69,9 +80,10 @@ def main():
         pressure={'min': 300, 'max': 1100}
     )
     
+    # One message per poll cycle carrying every sensor's reading
     telemetry_config = TelemetryConfig(
-        batch_enabled=False,
-        batch_size=10,
+        batch_enabled=True,
+        batch_size=len(sensors),
         include_timestamp=True,
         include_device_id=True,
         device_id="mock-device-001"
@@ -81,14 +93,13 @@ def main():
     
     print("\nReading sensors every 2 seconds. Press Ctrl+C to stop.\n")
     
+    period = 2.0
+    deadline = time.monotonic()
+    
     try:
         while True:
             # Read all sensors
-            readings = []
-            for sensor in sensors:
-                reading = sensor.read()
-                if reading:
-                    readings.append(reading)
+            readings = [reading for sensor in sensors if (reading := sensor.read())]
             
             # Process readings
             messages = processor.process_readings(readings)
@@ -100,7 +111,13 @@ def main():
                     status_icon = "✓" if reading.validation_status == "valid" else "✗"
                     print(f"  {status_icon} {reading.sensor_name}: {reading.value:.2f} {reading.unit}")
             
-            time.sleep(2)
+            # Sleep until the next absolute deadline to avoid cumulative drift
+            deadline += period
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            else:
+                deadline = time.monotonic()
             
     except KeyboardInterrupt:
         print("\n\nShutting down mock demo...")
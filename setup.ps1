@@ -9,7 +9,7 @@ Write-Host "Checking Python version..." -ForegroundColor Yellow
 python --version
 
 if ($LASTEXITCODE -ne 0) {
-    Write-Host "Error: Python not found. Please install Python 3.9 or higher." -ForegroundColor Red
+    Write-Host "Error: Python not found. Please install Python 3.10 or higher." -ForegroundColor Red
     exit 1
 }
 
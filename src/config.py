@@ -4,13 +4,20 @@ Handles loading and validation of application configuration
 """
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field, validator
+from typing import Any, Dict, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+# libyaml-backed loader when available, pure-Python fallback otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class ReconnectConfig(BaseModel):
     """MQTT reconnection configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     max_retries: int = Field(default=10, ge=1)
     initial_delay: int = Field(default=1, ge=1)
     max_delay: int = Field(default=300, ge=1)
@@ -19,6 +26,8 @@ class ReconnectConfig(BaseModel):
 
 class TLSConfig(BaseModel):
     """TLS/SSL configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     enabled: bool = False
     ca_certs: Optional[str] = None
     certfile: Optional[str] = None
@@ -27,20 +36,28 @@ class TLSConfig(BaseModel):
 
 class MQTTConfig(BaseModel):
     """MQTT broker configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     broker: str
     port: int = Field(default=1883, ge=1, le=65535)
     client_id: str
     username: Optional[str] = None
     password: Optional[str] = None
     qos: int = Field(default=1, ge=0, le=2)
+    telemetry_qos: Optional[int] = Field(default=None, ge=0, le=2)
     topic_prefix: str
     keepalive: int = Field(default=60, ge=10)
+    max_inflight_messages: int = Field(default=20, ge=1)
+    max_queued_messages: int = Field(default=1000, ge=0)
+    payload_format: str = Field(default="rows", pattern="^(rows|columnar)$")
     reconnect: ReconnectConfig = Field(default_factory=ReconnectConfig)
     tls: TLSConfig = Field(default_factory=TLSConfig)
 
 
 class ModbusSensorConfig(BaseModel):
     """Individual Modbus sensor configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     slave_id: int = Field(ge=1, le=247)
     register_address: int = Field(ge=0)
@@ -52,6 +69,8 @@ class ModbusSensorConfig(BaseModel):
 
 class ModbusConfig(BaseModel):
     """Modbus RTU configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     enabled: bool = True
     port: str
     baudrate: int = Field(default=9600)
@@ -59,11 +78,13 @@ class ModbusConfig(BaseModel):
     stopbits: int = Field(default=1, ge=1, le=2)
     bytesize: int = Field(default=8, ge=5, le=8)
     timeout: int = Field(default=3, ge=1)
-    sensors: list[ModbusSensorConfig] = Field(default_factory=list)
+    sensors: Tuple[ModbusSensorConfig, ...] = ()
 
 
 class I2CSensorConfig(BaseModel):
     """Individual I2C sensor configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     address: int = Field(ge=0x00, le=0x7F)
     sensor_type: str
@@ -74,13 +95,17 @@ class I2CSensorConfig(BaseModel):
 
 class I2CConfig(BaseModel):
     """I2C bus configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     enabled: bool = True
     bus: int = Field(default=1, ge=0)
-    sensors: list[I2CSensorConfig] = Field(default_factory=list)
+    sensors: Tuple[I2CSensorConfig, ...] = ()
 
 
 class ValidationRules(BaseModel):
     """Sensor data validation rules"""
+    model_config = ConfigDict(frozen=True)
+    
     temperature: Optional[Dict[str, float]] = None
     humidity: Optional[Dict[str, float]] = None
     pressure: Optional[Dict[str, float]] = None
@@ -89,8 +114,11 @@ class ValidationRules(BaseModel):
 
 class TelemetryConfig(BaseModel):
     """Telemetry settings"""
+    model_config = ConfigDict(frozen=True)
+    
     batch_enabled: bool = False
     batch_size: int = Field(default=10, ge=1)
+    batch_max_latency: float = Field(default=0.0, ge=0)
     include_timestamp: bool = True
     include_device_id: bool = True
     device_id: str
@@ -98,6 +126,8 @@ class TelemetryConfig(BaseModel):
 
 class ApplicationConfig(BaseModel):
     """Application-level configuration"""
+    model_config = ConfigDict(frozen=True)
+    
     name: str = "iot-edge-device"
     log_level: str = "INFO"
     poll_interval: int = Field(default=5, ge=1)
@@ -105,6 +135,8 @@ class ApplicationConfig(BaseModel):
 
 class Config(BaseModel):
     """Main configuration model"""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     application: ApplicationConfig
     mqtt: MQTTConfig
     modbus: ModbusConfig
@@ -112,7 +144,8 @@ class Config(BaseModel):
     validation: ValidationRules
     telemetry: TelemetryConfig
     
-    @validator('application')
+    @field_validator('application')
+    @classmethod
     def validate_log_level(cls, v):
         """Validate log level"""
         valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
@@ -125,6 +158,8 @@ def load_config(config_path: str = "config.yaml") -> Config:
     """
     Load and validate configuration from YAML file
     
+    Results are cached per file and reloaded when the file's mtime changes.
+    
     Args:
         config_path: Path to configuration file
         
@@ -140,7 +175,13 @@ def load_config(config_path: str = "config.yaml") -> Config:
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
-    with path.open('r') as f:
-        config_dict = yaml.safe_load(f)
+    return _load_cached(str(path.resolve()), path.stat().st_mtime)
+
+
+@lru_cache(maxsize=4)
+def _load_cached(path: str, mtime: float) -> Config:
+    """Parse and validate a config file; mtime is part of the cache key"""
+    with open(path, 'r') as f:
+        config_dict = yaml.load(f, Loader=_YAML_LOADER)
     
-    return Config(**config_dict)
+    return Config.model_validate(config_dict)
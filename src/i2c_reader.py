@@ -3,9 +3,12 @@ I2C sensor reader implementation
 Supports reading sensor data via I2C protocol
 """
 
-from typing import Optional, List
+from typing import Callable, Optional, List, Tuple
+from datetime import datetime
+import errno
 import struct
-from smbus2 import SMBus
+from types import MappingProxyType
+from smbus2 import SMBus, i2c_msg
 from src.sensor_interface import SensorInterface, SensorReading
 from src.config import I2CConfig, I2CSensorConfig
 from src.logger import get_logger
@@ -13,14 +16,45 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Pre-compiled unpackers for the raw data layouts
+_U16_BE = struct.Struct('>H')
+_U8x3 = struct.Struct('>BBB')
+
+# Linux caps a single I2C_RDWR ioctl at 42 messages (write + read per sensor)
+_MAX_SENSORS_PER_TRANSFER = 42 // 2
+
+# ioctl errors meaning the adapter itself rejects I2C_RDWR, not a device NACK
+_RDWR_UNSUPPORTED_ERRNOS = frozenset({errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL})
+
 
 class I2CSensor(SensorInterface):
     """I2C sensor implementation"""
     
+    # Sensor type -> (parser method name, minimum data length);
+    # anything else uses _GENERIC_PARSER
+    _PARSERS = {
+        "BMP280": ("_parse_bmp280", 6),
+        "BME280": ("_parse_bmp280", 6),
+        "BH1750": ("_parse_bh1750", 2),
+    }
+    _GENERIC_PARSER = ("_parse_generic", 2)
+    
     def __init__(self, config: I2CSensorConfig, bus: SMBus):
         super().__init__(config.name)
         self.config = config
         self.bus = bus
+        # Resolve the parser once instead of matching sensor_type per read
+        parser_name, self._min_length = self._PARSERS.get(
+            config.sensor_type.upper(), self._GENERIC_PARSER
+        )
+        self._parse: Callable[[bytes], float] = getattr(self, parser_name)
+        # Metadata is fixed by config, so build it once and share it read-only;
+        # a consumer mutating one reading's metadata would otherwise change all
+        self._metadata = MappingProxyType({
+            'address': hex(config.address),
+            'sensor_type': config.sensor_type,
+            'register': hex(config.register)
+        })
     
     def connect(self) -> bool:
         """Connection managed by I2CReader"""
@@ -38,45 +72,69 @@ class I2CSensor(SensorInterface):
         Returns:
             SensorReading or None if read failed
         """
+        data = self.read_raw()
+        
+        if data is None:
+            return None
+        
+        return self.decode(data)
+    
+    def read_raw(self) -> Optional[bytes]:
+        """
+        Read the raw data block from the I2C device
+        
+        Returns:
+            Raw data bytes or None if the bus transfer failed
+        """
         if not self.bus:
-            self.logger.error(f"I2C bus not available for sensor {self.name}")
+            self.logger.error("I2C bus not available for sensor %s", self.name)
             return None
         
         try:
-            # Read data from I2C device
-            data = self.bus.read_i2c_block_data(
+            return bytes(self.bus.read_i2c_block_data(
                 self.config.address,
                 self.config.register,
                 self.config.read_length
-            )
-            
-            # Parse data based on sensor type
-            value = self._parse_data(data)
-            
-            if value is None:
-                return None
-            
-            self.logger.debug(f"Read {self.name}: value={value}")
-            
-            return SensorReading(
-                sensor_name=self.name,
-                value=value,
-                unit=self.config.unit,
-                metadata={
-                    'address': hex(self.config.address),
-                    'sensor_type': self.config.sensor_type,
-                    'register': hex(self.config.register)
-                }
-            )
+            ))
             
         except OSError as e:
-            self.logger.error(f"I2C communication error reading {self.name}: {e}")
+            self.logger.error("I2C communication error reading %s: %s", self.name, e)
             return None
         except Exception as e:
-            self.logger.error(f"Unexpected error reading {self.name}: {e}")
+            self.logger.error("Unexpected error reading %s: %s", self.name, e)
             return None
     
-    def _parse_data(self, data: List[int]) -> Optional[float]:
+    def decode(
+        self,
+        data: bytes,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SensorReading]:
+        """
+        Decode a raw data block into a sensor reading
+        
+        Args:
+            data: Raw I2C data bytes
+            timestamp: Optional reading timestamp (defaults to now)
+            
+        Returns:
+            SensorReading or None if the data could not be parsed
+        """
+        value = self._parse_data(data)
+        
+        if value is None:
+            return None
+        
+        self.logger.debug("Read %s: value=%s", self.name, value)
+        
+        return SensorReading(
+            sensor_name=self.name,
+            value=value,
+            unit=self.config.unit,
+            timestamp=timestamp or datetime.utcnow(),
+            metadata=self._metadata
+        )
+    
+    def _parse_data(self, data: bytes) -> Optional[float]:
         """
         Parse I2C data based on sensor type
         
@@ -86,43 +144,40 @@ class I2CSensor(SensorInterface):
         Returns:
             Parsed float value or None
         """
+        if len(data) < self._min_length:
+            self.logger.error(
+                "Insufficient data for %s: got %s bytes, need %s",
+                self.config.sensor_type, len(data), self._min_length
+            )
+            return None
+        
         try:
-            # BMP280/BME280 pressure sensor
-            if self.config.sensor_type.upper() in ["BMP280", "BME280"]:
-                if len(data) < 6:
-                    self.logger.error("Insufficient data for BMP280")
-                    return None
-                
-                # Combine pressure bytes (20-bit value)
-                adc_p = (data[0] << 12) | (data[1] << 4) | (data[2] >> 4)
-                # Simplified conversion (actual requires calibration data)
-                pressure_hpa = adc_p / 256.0
-                return pressure_hpa
-            
-            # BH1750 light sensor
-            elif self.config.sensor_type.upper() == "BH1750":
-                if len(data) < 2:
-                    self.logger.error("Insufficient data for BH1750")
-                    return None
-                
-                # Combine 2 bytes (16-bit value)
-                light_level = (data[0] << 8) | data[1]
-                # Convert to lux (divide by 1.2 for high-res mode)
-                lux = light_level / 1.2
-                return lux
-            
-            # Generic 16-bit sensor
-            elif len(data) >= 2:
-                value = struct.unpack('>H', bytes(data[:2]))[0]
-                return float(value)
-            
-            else:
-                self.logger.error(f"Unsupported sensor type: {self.config.sensor_type}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing I2C data: {e}")
+            return self._parse(data)
+        except struct.error as e:
+            self.logger.error("Error parsing I2C data: %s", e)
             return None
+    
+    def _parse_bmp280(self, data: bytes) -> float:
+        """Parse BMP280/BME280 pressure data (at least 6 bytes)"""
+        # Combine pressure bytes (20-bit value)
+        msb, lsb, xlsb = _U8x3.unpack_from(data, 0)
+        adc_p = (msb << 12) | (lsb << 4) | (xlsb >> 4)
+        # Simplified conversion (actual requires calibration data)
+        pressure_hpa = adc_p / 256.0
+        return float(pressure_hpa)
+    
+    def _parse_bh1750(self, data: bytes) -> float:
+        """Parse BH1750 light sensor data (at least 2 bytes)"""
+        # Combine 2 bytes (16-bit value)
+        light_level, = _U16_BE.unpack_from(data, 0)
+        # Convert to lux (divide by 1.2 for high-res mode)
+        lux = light_level / 1.2
+        return float(lux)
+    
+    def _parse_generic(self, data: bytes) -> float:
+        """Parse a generic big-endian 16-bit sensor value (at least 2 bytes)"""
+        value, = _U16_BE.unpack_from(data, 0)
+        return float(value)
 
 
 class I2CReader:
@@ -132,6 +187,9 @@ class I2CReader:
         self.config = config
         self.bus: Optional[SMBus] = None
         self.sensors: List[I2CSensor] = []
+        self._transfers: List[Tuple[List[I2CSensor], List[i2c_msg]]] = []
+        # Cleared once the adapter rejects I2C_RDWR so it isn't retried every poll
+        self._combined_supported = True
         self.logger = get_logger(__name__)
     
     def connect(self) -> bool:
@@ -143,21 +201,23 @@ class I2CReader:
         """
         try:
             self.bus = SMBus(self.config.bus)
-            self.logger.info(f"Connected to I2C bus {self.config.bus}")
+            self.logger.info("Connected to I2C bus %s", self.config.bus)
             
             # Initialize sensors
             for sensor_config in self.config.sensors:
                 sensor = I2CSensor(sensor_config, self.bus)
                 self.sensors.append(sensor)
                 self.logger.info(
-                    f"Initialized I2C sensor: {sensor_config.name} "
-                    f"at address {hex(sensor_config.address)}"
+                    "Initialized I2C sensor: %s at address %s",
+                    sensor_config.name, hex(sensor_config.address)
                 )
             
+            self._build_transfers()
+            
             return True
             
         except Exception as e:
-            self.logger.error(f"Error connecting to I2C bus: {e}")
+            self.logger.error("Error connecting to I2C bus: %s", e)
             return False
     
     def disconnect(self) -> None:
@@ -166,22 +226,86 @@ class I2CReader:
             self.bus.close()
             self.logger.info("Disconnected from I2C bus")
         self.sensors.clear()
+        self._transfers.clear()
+    
+    def _build_transfers(self) -> None:
+        """Pre-build the combined register-select/read messages for every sensor"""
+        self._transfers.clear()
+        self._combined_supported = True
+        
+        for i in range(0, len(self.sensors), _MAX_SENSORS_PER_TRANSFER):
+            chunk = self.sensors[i:i + _MAX_SENSORS_PER_TRANSFER]
+            msgs = []
+            for sensor in chunk:
+                msgs.append(i2c_msg.write(sensor.config.address, [sensor.config.register]))
+                msgs.append(i2c_msg.read(sensor.config.address, sensor.config.read_length))
+            self._transfers.append((chunk, msgs))
     
-    def read_all(self) -> List[SensorReading]:
+    def _read_blocks(self) -> List[Tuple[I2CSensor, Optional[bytes]]]:
+        """
+        Read the raw data block of every sensor
+        
+        Each chunk of sensors is read in a single I2C_RDWR ioctl. A chunk
+        whose transfer fails (e.g. one sensor NACKs) is read per sensor for
+        this cycle only; if the adapter rejects I2C_RDWR outright, every
+        sensor is read individually until the next connect().
+        
+        Returns:
+            List of (sensor, raw data or None) tuples
+        """
+        bus = self.bus
+        if bus is None or not self._combined_supported:
+            return [(sensor, sensor.read_raw()) for sensor in self.sensors]
+        
+        blocks: List[Tuple[I2CSensor, Optional[bytes]]] = []
+        
+        for index, (sensors, msgs) in enumerate(self._transfers):
+            try:
+                bus.i2c_rdwr(*msgs)
+            except OSError as e:
+                if e.errno in _RDWR_UNSUPPORTED_ERRNOS:
+                    self.logger.warning(
+                        "I2C adapter rejected combined transfers, "
+                        "reading sensors individually from now on: %s", e
+                    )
+                    self._combined_supported = False
+                    for remaining, _ in self._transfers[index:]:
+                        blocks.extend((sensor, sensor.read_raw()) for sensor in remaining)
+                    break
+                
+                self.logger.warning(
+                    "Combined I2C transfer failed, reading sensors individually: %s", e
+                )
+                blocks.extend((sensor, sensor.read_raw()) for sensor in sensors)
+                continue
+            
+            blocks.extend(zip(sensors, (bytes(msg) for msg in msgs[1::2])))
+        
+        return blocks
+    
+    def read_all(self, timestamp: Optional[datetime] = None) -> List[SensorReading]:
         """
         Read all configured sensors
         
+        Args:
+            timestamp: Optional timestamp shared by every reading
+                (taken once per call if not provided)
+        
         Returns:
             List of SensorReading objects
         """
-        readings = []
+        if timestamp is None:
+            timestamp = datetime.utcnow()
         
-        for sensor in self.sensors:
-            reading = sensor.read()
-            if reading:
-                readings.append(reading)
+        # Finish every bus transfer before decoding so the bus is not
+        # left idle while Python parses each block
+        blocks = self._read_blocks()
         
-        return readings
+        return [
+            reading
+            for sensor, data in blocks
+            if data is not None and (reading := sensor.decode(data, timestamp))
+        ]
     
     def __enter__(self):
         """Context manager entry"""
@@ -1,24 +1,92 @@
 """
 Logging configuration module
-Provides centralized logging setup with JSON formatting and file rotation
+Provides centralized logging setup with JSON formatting on a background thread
 """
 
+import atexit
+import copy
 import logging
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
-from pythonjsonlogger import jsonlogger
+from queue import SimpleQueue
+from typing import Dict, List, Optional, Tuple
+import orjson
 
 
-class CustomJsonFormatter(jsonlogger.JsonFormatter):
-    """Custom JSON formatter with additional fields"""
+# Background listeners started by setup_logging, keyed by app name
+_queue_listeners: Dict[str, QueueListener] = {}
+
+# (level name, log file) each running listener was configured with
+_logging_setups: Dict[str, Tuple[str, Optional[str]]] = {}
+
+_LOG_LEVELS: Dict[str, int] = {
+    'CRITICAL': logging.CRITICAL,
+    'FATAL': logging.FATAL,
+    'ERROR': logging.ERROR,
+    'WARNING': logging.WARNING,
+    'WARN': logging.WARN,
+    'INFO': logging.INFO,
+    'DEBUG': logging.DEBUG,
+    'NOTSET': logging.NOTSET,
+}
+
+# logging.Formatter's default date/time and millisecond layouts
+_DEFAULT_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+_DEFAULT_MSEC_FORMAT = '%s,%03d'
+
+
+class _RecordQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener's handlers"""
     
-    def add_fields(self, log_record, record, message_dict):
-        super(CustomJsonFormatter, self).add_fields(log_record, record, message_dict)
-        log_record['level'] = record.levelname
-        log_record['logger'] = record.name
-        log_record['module'] = record.module
-        log_record['function'] = record.funcName
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now (they may be mutated later) but keep exc_info so the
+        # JSON formatter still renders it as a separate field
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class CustomJsonFormatter(logging.Formatter):
+    """JSON log formatter serializing each record with orjson"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (epoch second, formatted date/time) of the last default timestamp
+        self._time_cache: Tuple[int, str] = (-1, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format the record time, reusing the date/time text within a second"""
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached_second, prefix = self._time_cache
+        if second != cached_second:
+            prefix = time.strftime(_DEFAULT_TIME_FORMAT, self.converter(record.created))
+            self._time_cache = (second, prefix)
+        
+        return _DEFAULT_MSEC_FORMAT % (prefix, record.msecs)
+    
+    def format(self, record: logging.LogRecord) -> str:
+        log_record = {
+            'timestamp': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'name': record.name,
+            'message': record.getMessage(),
+            'logger': record.name,
+            'module': record.module,
+            'function': record.funcName
+        }
+        
+        if record.exc_info:
+            log_record['exc_info'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            log_record['stack_info'] = self.formatStack(record.stack_info)
+        
+        return orjson.dumps(log_record, default=str).decode()
 
 
 def setup_logging(
@@ -29,6 +97,9 @@ def setup_logging(
     """
     Configure logging with console and optional file output
     
+    Calling again with the same settings returns the already configured
+    logger without rebuilding its handlers.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path for logging
@@ -37,20 +108,26 @@ def setup_logging(
     Returns:
         Configured logger instance
     """
+    level_name = log_level.upper()
     logger = logging.getLogger(app_name)
-    logger.setLevel(getattr(logging, log_level.upper()))
     
-    # Remove existing handlers
+    setup = (level_name, log_file)
+    if _logging_setups.get(app_name) == setup and app_name in _queue_listeners:
+        return logger
+    
+    logger.setLevel(_LOG_LEVELS[level_name])
+    
+    # Remove existing handlers and stop a listener from a previous setup
     logger.handlers.clear()
+    shutdown_logging(app_name)
+    
+    handlers: List[logging.Handler] = []
     
     # Console handler with JSON formatting
     console_handler = logging.StreamHandler(sys.stdout)
-    console_formatter = CustomJsonFormatter(
-        '%(timestamp)s %(level)s %(name)s %(message)s',
-        rename_fields={'timestamp': 'asctime'}
-    )
+    console_formatter = CustomJsonFormatter()
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler if specified
     if log_file:
@@ -59,11 +136,45 @@ def setup_logging(
         
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(console_formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # JSON formatting and stream/file I/O run on the listener thread;
+    # callers only pay for enqueueing the record
+    log_queue: SimpleQueue = SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners[app_name] = listener
+    _logging_setups[app_name] = setup
+    
+    logger.addHandler(_RecordQueueHandler(log_queue))
     
     return logger
 
 
+def shutdown_logging(app_name: str = "iot-edge-device") -> None:
+    """
+    Stop the background log listener for an application logger
+    
+    Records already queued are written out before this returns.
+    
+    Args:
+        app_name: Application name passed to setup_logging
+    """
+    _logging_setups.pop(app_name, None)
+    listener = _queue_listeners.pop(app_name, None)
+    if listener:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+@atexit.register
+def _shutdown_all_logging() -> None:
+    """Flush every background log listener at interpreter exit"""
+    for app_name in list(_queue_listeners):
+        shutdown_logging(app_name)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance
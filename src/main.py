@@ -3,18 +3,35 @@ Main application orchestrator
 Coordinates sensor reading, validation, and MQTT publishing
 """
 
+import asyncio
 import time
 import signal
 import sys
-from typing import Optional
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Deque, List, Optional, Union
+from datetime import datetime
 from pathlib import Path
 from src.config import load_config, Config
-from src.logger import setup_logging, get_logger
-from src.modbus_reader import ModbusReader
-from src.i2c_reader import I2CReader
-from src.telemetry import TelemetryProcessor
+from src.logger import setup_logging, shutdown_logging, get_logger
+from src.sensor_interface import SensorReading
+from src.telemetry import TelemetryMessage, TelemetryProcessor
 from src.mqtt_publisher import MQTTPublisher
 
+if TYPE_CHECKING:
+    # Bus readers are imported in initialize() only when enabled, so a
+    # disabled bus never loads its driver library (pymodbus, smbus2)
+    from src.modbus_reader import ModbusReader
+    from src.i2c_reader import I2CReader
+
+
+# Telemetry messages buffered for the publisher thread; oldest are dropped when full
+_TX_QUEUE_SIZE = 1024
+
+# Seconds to wait at shutdown for the broker to acknowledge QoS 1/2 telemetry
+_SHUTDOWN_FLUSH_TIMEOUT = 5
+
 
 class IoTEdgeDevice:
     """Main IoT edge device application"""
@@ -34,12 +51,29 @@ class IoTEdgeDevice:
         self.logger.info("Initializing IoT Edge Device")
         
         # Initialize components
-        self.modbus_reader: Optional[ModbusReader] = None
-        self.i2c_reader: Optional[I2CReader] = None
+        self.modbus_reader: Optional["ModbusReader"] = None
+        self.i2c_reader: Optional["I2CReader"] = None
         self.telemetry_processor: Optional[TelemetryProcessor] = None
         self.mqtt_publisher: Optional[MQTTPublisher] = None
         
+        # One worker per bus so Modbus and I2C reads always overlap
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='io')
+        # Reused every poll; nothing downstream keeps a reference to the list
+        self._readings_buf: List[SensorReading] = []
+        
+        # Poll loop appends, publisher thread drains; a stalled broker never blocks polling
+        self._tx_queue: Deque[TelemetryMessage] = deque(maxlen=_TX_QUEUE_SIZE)
+        self._tx_cond = threading.Condition()
+        self._tx_dropped = 0
+        self._tx_thread: Optional[threading.Thread] = None
+        # Cleared only once the poll loop has queued its last messages
+        self._tx_running = False
+        
         self._running = False
+        self._stopped = False
+        # Set by _run_loop so a signal can cut the inter-poll sleep short
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
         self._setup_signal_handlers()
     
     def _setup_signal_handlers(self) -> None:
@@ -49,8 +83,15 @@ class IoTEdgeDevice:
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals"""
-        self.logger.info(f"Received signal {signum}, initiating shutdown")
-        self.stop()
+        self.logger.info("Received signal %s, initiating shutdown", signum)
+        # The handler runs on the poll loop's thread, possibly mid-poll, so it
+        # only asks the loop to exit; run() tears down once the loop returns
+        self._running = False
+        
+        loop, stop_event = self._loop, self._stop_event
+        if loop is not None and stop_event is not None:
+            # Wake the loop from its sleep instead of waiting out poll_interval
+            loop.call_soon_threadsafe(stop_event.set)
     
     def initialize(self) -> bool:
         """
@@ -75,6 +116,8 @@ class IoTEdgeDevice:
             
             # Initialize Modbus reader if enabled
             if self.config.modbus.enabled:
+                from src.modbus_reader import ModbusReader
+                
                 self.modbus_reader = ModbusReader(self.config.modbus)
                 if not self.modbus_reader.connect():
                     self.logger.warning("Failed to connect to Modbus, continuing without it")
@@ -82,6 +125,8 @@ class IoTEdgeDevice:
             
             # Initialize I2C reader if enabled
             if self.config.i2c.enabled:
+                from src.i2c_reader import I2CReader
+                
                 self.i2c_reader = I2CReader(self.config.i2c)
                 if not self.i2c_reader.connect():
                     self.logger.warning("Failed to connect to I2C, continuing without it")
@@ -91,71 +136,192 @@ class IoTEdgeDevice:
             return True
             
         except Exception as e:
-            self.logger.error(f"Initialization failed: {e}", exc_info=True)
+            self.logger.error("Initialization failed: %s", e, exc_info=True)
             return False
     
     def run(self) -> None:
         """Run the main application loop"""
         self.logger.info("Starting main application loop")
         self._running = True
+        self._tx_running = True
+        
+        self._tx_thread = threading.Thread(
+            target=self._drain_tx, name='mqtt-tx', daemon=True
+        )
+        self._tx_thread.start()
         
+        try:
+            asyncio.run(self._run_loop())
+        finally:
+            self.stop()
+    
+    async def _run_loop(self) -> None:
+        """Poll sensors every poll_interval until stopped"""
         poll_interval = self.config.application.poll_interval
         
-        while self._running:
-            try:
-                self._poll_sensors()
-                time.sleep(poll_interval)
+        stop_event = asyncio.Event()
+        self._stop_event = stop_event
+        self._loop = asyncio.get_running_loop()
+        
+        # Schedule against absolute deadlines so poll time doesn't accumulate as drift
+        deadline = time.monotonic()
+        
+        try:
+            while self._running:
+                try:
+                    await self._poll_sensors()
+                    
+                except Exception as e:
+                    self.logger.error("Error in main loop: %s", e, exc_info=True)
                 
-            except Exception as e:
-                self.logger.error(f"Error in main loop: {e}", exc_info=True)
-                time.sleep(poll_interval)
+                deadline += poll_interval
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    # Overran the period; restart the schedule rather than bursting to catch up
+                    deadline = time.monotonic()
+                    await asyncio.sleep(0)
+        finally:
+            self._loop = None
+            self._stop_event = None
     
-    def _poll_sensors(self) -> None:
+    async def _poll_sensors(self) -> None:
         """Poll all sensors and publish telemetry"""
-        readings = []
-        
-        # Read Modbus sensors
-        if self.modbus_reader:
-            try:
-                modbus_readings = self.modbus_reader.read_all()
-                readings.extend(modbus_readings)
-                self.logger.debug(f"Read {len(modbus_readings)} Modbus readings")
-            except Exception as e:
-                self.logger.error(f"Error reading Modbus sensors: {e}")
+        # One timestamp per poll, shared by every reading and message
+        timestamp = datetime.utcnow()
         
-        # Read I2C sensors
-        if self.i2c_reader:
-            try:
-                i2c_readings = self.i2c_reader.read_all()
-                readings.extend(i2c_readings)
-                self.logger.debug(f"Read {len(i2c_readings)} I2C readings")
-            except Exception as e:
-                self.logger.error(f"Error reading I2C sensors: {e}")
+        # Modbus and I2C share no hardware, so read both buses concurrently
+        modbus_readings, i2c_readings = await asyncio.gather(
+            self._read_sensors(self.modbus_reader, "Modbus", timestamp),
+            self._read_sensors(self.i2c_reader, "I2C", timestamp)
+        )
+        readings = self._readings_buf
+        readings.clear()
+        readings.extend(modbus_readings)
+        readings.extend(i2c_readings)
         
-        # Process and publish readings
+        # Process readings and queue them for the publisher thread
         if readings and self.telemetry_processor and self.mqtt_publisher:
             try:
-                messages = self.telemetry_processor.process_readings(readings)
-                
-                for message in messages:
-                    success = self.mqtt_publisher.publish(message)
-                    if success:
-                        self.logger.info(
-                            f"Published telemetry with {len(message.readings)} readings"
-                        )
-                    else:
-                        self.logger.error("Failed to publish telemetry")
+                messages = self.telemetry_processor.process_readings(readings, timestamp)
+                self._enqueue_tx(messages)
                         
             except Exception as e:
-                self.logger.error(f"Error processing/publishing telemetry: {e}")
+                self.logger.error("Error processing telemetry: %s", e)
         else:
             self.logger.debug("No readings to publish")
     
+    def _enqueue_tx(self, messages: List[TelemetryMessage]) -> None:
+        """
+        Queue telemetry messages for publishing without blocking
+        
+        Args:
+            messages: TelemetryMessage objects to publish
+        """
+        if not messages:
+            return
+        
+        with self._tx_cond:
+            tx_queue = self._tx_queue
+            overflow = len(tx_queue) + len(messages) - _TX_QUEUE_SIZE
+            if overflow > 0:
+                self._tx_dropped += overflow
+            tx_queue.extend(messages)
+            self._tx_cond.notify()
+    
+    def _drain_tx(self) -> None:
+        """Publish queued telemetry until stopped and the queue is empty"""
+        while True:
+            with self._tx_cond:
+                while self._tx_running and not self._tx_queue:
+                    self._tx_cond.wait()
+                
+                if not self._tx_queue:
+                    return
+                
+                # Take the whole backlog so it goes out as one MQTT message
+                messages = list(self._tx_queue)
+                self._tx_queue.clear()
+                dropped, self._tx_dropped = self._tx_dropped, 0
+            
+            if dropped:
+                self.logger.warning(
+                    "Dropped %s telemetry messages while the publisher was behind",
+                    dropped
+                )
+            
+            try:
+                if self.mqtt_publisher and self.mqtt_publisher.publish_batch(messages):
+                    self.logger.info(
+                        "Published %s telemetry messages with %s readings",
+                        len(messages),
+                        sum(len(message.readings) for message in messages)
+                    )
+                else:
+                    self.logger.error("Failed to publish telemetry")
+            except Exception as e:
+                self.logger.error("Error publishing telemetry: %s", e)
+    
+    async def _read_sensors(
+        self,
+        reader: Optional[Union["ModbusReader", "I2CReader"]],
+        bus_name: str,
+        timestamp: datetime
+    ) -> List[SensorReading]:
+        """
+        Read all sensors of one reader on the I/O thread pool
+        
+        Args:
+            reader: Modbus or I2C reader, or None if disabled
+            bus_name: Bus name used in log messages
+            timestamp: Poll timestamp for the readings
+            
+        Returns:
+            List of SensorReading objects (empty on error)
+        """
+        if not reader:
+            return []
+        
+        try:
+            loop = asyncio.get_running_loop()
+            readings = await loop.run_in_executor(self._io_pool, reader.read_all, timestamp)
+            self.logger.debug("Read %s %s readings", len(readings), bus_name)
+            return readings
+        except Exception as e:
+            self.logger.error("Error reading %s sensors: %s", bus_name, e)
+            return []
+    
     def stop(self) -> None:
-        """Stop the application and cleanup resources"""
-        self.logger.info("Stopping IoT Edge Device")
+        """
+        Stop the application and cleanup resources
+        
+        Called by run() once the poll loop has returned; safe to call again.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
         self._running = False
         
+        self.logger.info("Stopping IoT Edge Device")
+        
+        # Queue any batch still waiting on batch_max_latency
+        if self.telemetry_processor:
+            pending = self.telemetry_processor.normalizer.flush()
+            if pending:
+                self._enqueue_tx([pending])
+        
+        with self._tx_cond:
+            self._tx_running = False
+            self._tx_cond.notify_all()
+        
+        # Publish whatever is still queued before disconnecting
+        if self._tx_thread and self._tx_thread is not threading.current_thread():
+            self._tx_thread.join(timeout=5)
+        
         # Disconnect from sensors
         if self.modbus_reader:
             self.modbus_reader.disconnect()
@@ -163,11 +329,18 @@ class IoTEdgeDevice:
         if self.i2c_reader:
             self.i2c_reader.disconnect()
         
-        # Disconnect from MQTT
+        self._io_pool.shutdown(wait=False)
+        
+        # Disconnect from MQTT once in-flight telemetry is acknowledged
         if self.mqtt_publisher:
+            if self.mqtt_publisher.is_connected:
+                self.mqtt_publisher.flush(timeout=_SHUTDOWN_FLUSH_TIMEOUT)
             self.mqtt_publisher.disconnect()
         
         self.logger.info("Shutdown complete")
+        
+        # Drain queued log records before the process exits
+        shutdown_logging(self.config.application.name)
     
     def __enter__(self):
         """Context manager entry"""
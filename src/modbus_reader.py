@@ -3,8 +3,10 @@ Modbus RTU/RS485 sensor reader implementation
 Supports reading sensor data via Modbus RTU protocol
 """
 
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
+from datetime import datetime
 import struct
+from types import MappingProxyType
 from pymodbus.client import ModbusSerialClient
 from pymodbus.exceptions import ModbusException
 from src.sensor_interface import SensorInterface, SensorReading
@@ -14,14 +16,56 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Pre-compiled packers for register decoding
+_S_H = struct.Struct('>H')
+_S_h = struct.Struct('>h')
+_S_HH = struct.Struct('>HH')
+_S_i = struct.Struct('>i')
+_S_I = struct.Struct('>I')
+_S_f = struct.Struct('>f')
+
+# Modbus caps a single holding-register read at 125 registers
+_MAX_REGISTERS_PER_READ = 125
+
+# (slave_id, base address, register count, [(sensor, offset into block)])
+RegisterBlock = Tuple[int, int, int, List[Tuple["ModbusSensor", int]]]
+
 
 class ModbusSensor(SensorInterface):
     """Modbus RTU sensor implementation"""
     
+    # Data type -> (parser method name, registers required)
+    _PARSERS = {
+        "int16": ("_parse_int16", 1),
+        "uint16": ("_parse_uint16", 1),
+        "int32": ("_parse_int32", 2),
+        "uint32": ("_parse_uint32", 2),
+        "float32": ("_parse_float32", 2),
+    }
+    
     def __init__(self, config: ModbusSensorConfig, client: ModbusSerialClient):
         super().__init__(config.name)
         self.config = config
         self.client = client
+        # Resolve the parser once instead of matching data_type per read
+        parser = self._PARSERS.get(config.data_type)
+        if parser:
+            self._parse: Optional[Callable[[List[int]], float]] = getattr(self, parser[0])
+            self._min_registers = parser[1]
+        else:
+            self._parse = None
+            self._min_registers = 0
+        # Reused for register-to-value conversion so decoding doesn't allocate bytes
+        self._scratch = bytearray(4)
+        # Config is immutable, so the per-reading values are computed once
+        self._unit = config.unit
+        self._scale = config.scaling_factor
+        # Shared by every reading, so read-only to keep mutations from leaking
+        self._metadata = MappingProxyType({
+            'slave_id': config.slave_id,
+            'register_address': config.register_address,
+            'data_type': config.data_type
+        })
     
     def connect(self) -> bool:
         """Connection managed by ModbusReader"""
@@ -39,8 +83,22 @@ class ModbusSensor(SensorInterface):
         Returns:
             SensorReading or None if read failed
         """
+        registers = self.read_registers()
+        
+        if registers is None:
+            return None
+        
+        return self.decode(registers)
+    
+    def read_registers(self) -> Optional[List[int]]:
+        """
+        Read this sensor's raw register values without decoding them
+        
+        Returns:
+            Register values or None if read failed
+        """
         if not self.client or not self.client.connected:
-            self.logger.error(f"Modbus client not connected for sensor {self.name}")
+            self.logger.error("Modbus client not connected for sensor %s", self.name)
             return None
         
         try:
@@ -52,40 +110,55 @@ class ModbusSensor(SensorInterface):
             )
             
             if result.isError():
-                self.logger.error(f"Error reading Modbus registers for {self.name}: {result}")
-                return None
-            
-            # Parse data based on type
-            raw_value = self._parse_registers(result.registers)
-            
-            if raw_value is None:
+                self.logger.error("Error reading Modbus registers for %s: %s", self.name, result)
                 return None
             
-            # Apply scaling factor
-            scaled_value = raw_value * self.config.scaling_factor
-            
-            self.logger.debug(
-                f"Read {self.name}: raw={raw_value}, scaled={scaled_value}"
-            )
-            
-            return SensorReading(
-                sensor_name=self.name,
-                value=scaled_value,
-                unit=self.config.unit,
-                metadata={
-                    'slave_id': self.config.slave_id,
-                    'register_address': self.config.register_address,
-                    'data_type': self.config.data_type
-                }
-            )
+            registers: List[int] = result.registers
+            return registers
             
         except ModbusException as e:
-            self.logger.error(f"Modbus exception reading {self.name}: {e}")
+            self.logger.error("Modbus exception reading %s: %s", self.name, e)
             return None
         except Exception as e:
-            self.logger.error(f"Unexpected error reading {self.name}: {e}")
+            self.logger.error("Unexpected error reading %s: %s", self.name, e)
             return None
     
+    def decode(
+        self,
+        registers: List[int],
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SensorReading]:
+        """
+        Decode this sensor's register values into a sensor reading
+        
+        Args:
+            registers: Register values starting at the sensor's register_address
+            timestamp: Optional reading timestamp (defaults to now)
+            
+        Returns:
+            SensorReading or None if the registers could not be parsed
+        """
+        # Parse data based on type
+        raw_value = self._parse_registers(registers)
+        
+        if raw_value is None:
+            return None
+        
+        # Apply scaling factor
+        scaled_value = raw_value * self._scale
+        
+        self.logger.debug(
+            "Read %s: raw=%s, scaled=%s", self.name, raw_value, scaled_value
+        )
+        
+        return SensorReading(
+            sensor_name=self.name,
+            value=scaled_value,
+            unit=self._unit,
+            timestamp=timestamp or datetime.utcnow(),
+            metadata=self._metadata
+        )
+    
     def _parse_registers(self, registers: List[int]) -> Optional[float]:
         """
         Parse register values based on data type
@@ -96,41 +169,43 @@ class ModbusSensor(SensorInterface):
         Returns:
             Parsed float value or None
         """
+        if self._parse is None:
+            self.logger.error("Unsupported data type: %s", self.config.data_type)
+            return None
+        
+        if len(registers) < self._min_registers:
+            self.logger.error("Insufficient registers for %s", self.config.data_type)
+            return None
+        
         try:
-            if self.config.data_type == "int16":
-                return float(struct.unpack('>h', struct.pack('>H', registers[0]))[0])
-            
-            elif self.config.data_type == "uint16":
-                return float(registers[0])
-            
-            elif self.config.data_type == "int32":
-                if len(registers) < 2:
-                    self.logger.error("Insufficient registers for int32")
-                    return None
-                data = struct.pack('>HH', registers[0], registers[1])
-                return float(struct.unpack('>i', data)[0])
-            
-            elif self.config.data_type == "uint32":
-                if len(registers) < 2:
-                    self.logger.error("Insufficient registers for uint32")
-                    return None
-                data = struct.pack('>HH', registers[0], registers[1])
-                return float(struct.unpack('>I', data)[0])
-            
-            elif self.config.data_type == "float32":
-                if len(registers) < 2:
-                    self.logger.error("Insufficient registers for float32")
-                    return None
-                data = struct.pack('>HH', registers[0], registers[1])
-                return struct.unpack('>f', data)[0]
-            
-            else:
-                self.logger.error(f"Unsupported data type: {self.config.data_type}")
-                return None
-                
-        except Exception as e:
-            self.logger.error(f"Error parsing registers: {e}")
+            return self._parse(registers)
+        except struct.error as e:
+            self.logger.error("Error parsing registers: %s", e)
             return None
+    
+    def _parse_int16(self, registers: List[int]) -> float:
+        """Parse a signed 16-bit register"""
+        _S_H.pack_into(self._scratch, 0, registers[0])
+        return float(_S_h.unpack_from(self._scratch, 0)[0])
+    
+    def _parse_uint16(self, registers: List[int]) -> float:
+        """Parse an unsigned 16-bit register"""
+        return float(registers[0])
+    
+    def _parse_int32(self, registers: List[int]) -> float:
+        """Parse a signed 32-bit value from two big-endian registers"""
+        _S_HH.pack_into(self._scratch, 0, registers[0], registers[1])
+        return float(_S_i.unpack_from(self._scratch, 0)[0])
+    
+    def _parse_uint32(self, registers: List[int]) -> float:
+        """Parse an unsigned 32-bit value from two big-endian registers"""
+        _S_HH.pack_into(self._scratch, 0, registers[0], registers[1])
+        return float(_S_I.unpack_from(self._scratch, 0)[0])
+    
+    def _parse_float32(self, registers: List[int]) -> float:
+        """Parse an IEEE 754 float from two big-endian registers"""
+        _S_HH.pack_into(self._scratch, 0, registers[0], registers[1])
+        return float(_S_f.unpack_from(self._scratch, 0)[0])
 
 
 class ModbusReader:
@@ -140,6 +215,7 @@ class ModbusReader:
         self.config = config
         self.client: Optional[ModbusSerialClient] = None
         self.sensors: List[ModbusSensor] = []
+        self._blocks: List[RegisterBlock] = []
         self.logger = get_logger(__name__)
     
     def connect(self) -> bool:
@@ -160,21 +236,23 @@ class ModbusReader:
             )
             
             if self.client.connect():
-                self.logger.info(f"Connected to Modbus port {self.config.port}")
+                self.logger.info("Connected to Modbus port %s", self.config.port)
                 
                 # Initialize sensors
                 for sensor_config in self.config.sensors:
                     sensor = ModbusSensor(sensor_config, self.client)
                     self.sensors.append(sensor)
-                    self.logger.info(f"Initialized Modbus sensor: {sensor_config.name}")
+                    self.logger.info("Initialized Modbus sensor: %s", sensor_config.name)
+                
+                self._build_blocks()
                 
                 return True
             else:
-                self.logger.error(f"Failed to connect to Modbus port {self.config.port}")
+                self.logger.error("Failed to connect to Modbus port %s", self.config.port)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error connecting to Modbus: {e}")
+            self.logger.error("Error connecting to Modbus: %s", e)
             return False
     
     def disconnect(self) -> None:
@@ -183,22 +261,128 @@ class ModbusReader:
             self.client.close()
             self.logger.info("Disconnected from Modbus")
         self.sensors.clear()
+        self._blocks.clear()
+    
+    def _build_blocks(self) -> None:
+        """Coalesce sensors on contiguous registers of one slave into shared reads"""
+        self._blocks.clear()
+        
+        ordered = sorted(
+            self.sensors,
+            key=lambda s: (s.config.slave_id, s.config.register_address)
+        )
+        
+        for sensor in ordered:
+            cfg = sensor.config
+            
+            if self._blocks:
+                slave_id, base, count, members = self._blocks[-1]
+                end = cfg.register_address + cfg.register_count
+                if (slave_id == cfg.slave_id
+                        and cfg.register_address == base + count
+                        and end - base <= _MAX_REGISTERS_PER_READ):
+                    members.append((sensor, count))
+                    self._blocks[-1] = (slave_id, base, end - base, members)
+                    continue
+            
+            self._blocks.append(
+                (cfg.slave_id, cfg.register_address, cfg.register_count, [(sensor, 0)])
+            )
     
-    def read_all(self) -> List[SensorReading]:
+    def _read_block(
+        self,
+        block: RegisterBlock,
+        timestamp: datetime
+    ) -> List[Tuple[ModbusSensor, Optional[SensorReading]]]:
+        """
+        Read one coalesced register block and decode each member sensor
+        
+        Falls back to per-sensor reads if the block read fails.
+        
+        Args:
+            block: Register block built by _build_blocks
+            timestamp: Timestamp for the decoded readings
+            
+        Returns:
+            List of (sensor, reading or None) tuples
+        """
+        slave_id, base, count, members = block
+        
+        if len(members) == 1 or not self.client or not self.client.connected:
+            return self._read_individually(members, timestamp)
+        
+        try:
+            result = self.client.read_holding_registers(
+                address=base,
+                count=count,
+                slave=slave_id
+            )
+            if result.isError():
+                raise ModbusException(str(result))
+            registers = result.registers
+        except Exception as e:
+            self.logger.warning(
+                "Block read of slave %s registers %s-%s failed, "
+                "reading sensors individually: %s",
+                slave_id, base, base + count - 1, e
+            )
+            return self._read_individually(members, timestamp)
+        
+        return [
+            (
+                sensor,
+                sensor.decode(
+                    registers[offset:offset + sensor.config.register_count], timestamp
+                )
+            )
+            for sensor, offset in members
+        ]
+    
+    def _read_individually(
+        self,
+        members: List[Tuple[ModbusSensor, int]],
+        timestamp: datetime
+    ) -> List[Tuple[ModbusSensor, Optional[SensorReading]]]:
+        """
+        Read and decode each sensor of a block with its own transaction
+        
+        Args:
+            members: (sensor, offset) pairs of a register block
+            timestamp: Timestamp for the decoded readings
+            
+        Returns:
+            List of (sensor, reading or None) tuples
+        """
+        results: List[Tuple[ModbusSensor, Optional[SensorReading]]] = []
+        
+        for sensor, _ in members:
+            registers = sensor.read_registers()
+            reading = sensor.decode(registers, timestamp) if registers is not None else None
+            results.append((sensor, reading))
+        
+        return results
+    
+    def read_all(self, timestamp: Optional[datetime] = None) -> List[SensorReading]:
         """
         Read all configured sensors
         
+        Args:
+            timestamp: Optional timestamp shared by every reading
+                (taken once per call if not provided)
+        
         Returns:
             List of SensorReading objects
         """
-        readings = []
+        results: Dict[ModbusSensor, Optional[SensorReading]] = {}
+        
+        if timestamp is None:
+            timestamp = datetime.utcnow()
         
-        for sensor in self.sensors:
-            reading = sensor.read()
-            if reading:
-                readings.append(reading)
+        # One bus transaction per block of contiguous registers
+        for block in self._blocks:
+            results.update(self._read_block(block, timestamp))
         
-        return readings
+        return [reading for sensor in self.sensors if (reading := results.get(sensor))]
     
     def __enter__(self):
         """Context manager entry"""
@@ -1,13 +1,16 @@
 """
 MQTT publisher with reconnection logic and exponential backoff
-Publishes telemetry data to MQTT broker with QoS 1
+Publishes telemetry data to MQTT broker with configurable QoS (default 1)
 """
 
-import json
 import time
+import socket
+import threading
+from collections import deque
 import ssl
-from typing import Optional, Callable
+from typing import Deque, Dict, List, Optional, Callable
 from datetime import datetime
+import orjson
 import paho.mqtt.client as mqtt
 from tenacity import (
     retry,
@@ -23,6 +26,9 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds to wait for CONNACK after connecting
+_CONNECT_TIMEOUT = 10
+
 
 class MQTTPublisher:
     """MQTT publisher with automatic reconnection and exponential backoff"""
@@ -31,7 +37,24 @@ class MQTTPublisher:
         self.config = config
         self.client: Optional[mqtt.Client] = None
         self.logger = get_logger(__name__)
+        self._telemetry_topic = f"{config.topic_prefix}/telemetry"
+        self._serialize: Callable[[TelemetryMessage], bytes] = (
+            TelemetryMessage.to_columnar_bytes
+            if config.payload_format == "columnar"
+            else TelemetryMessage.to_bytes
+        )
+        # Full topic per publish_json suffix, built on first use
+        self._topic_cache: Dict[str, str] = {}
+        self._telemetry_qos = (
+            config.telemetry_qos if config.telemetry_qos is not None else config.qos
+        )
         self._connected = False
+        # Set by _on_connect once the broker has answered a connect attempt
+        self._connect_event = threading.Event()
+        # Built on first TLS connect and reused by every retry and reconnect
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        # QoS 1/2 publishes not yet acknowledged, oldest first
+        self._unacked: Deque[mqtt.MQTTMessageInfo] = deque()
         self._connection_callbacks: list[Callable] = []
         self._disconnection_callbacks: list[Callable] = []
     
@@ -46,10 +69,10 @@ class MQTTPublisher:
             self._attempt_connection()
             return True
         except RetryError as e:
-            self.logger.error(f"Failed to connect to MQTT broker after retries: {e}")
+            self.logger.error("Failed to connect to MQTT broker after retries: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error connecting to MQTT: {e}")
+            self.logger.error("Unexpected error connecting to MQTT: %s", e)
             return False
     
     @retry(
@@ -64,6 +87,8 @@ class MQTTPublisher:
     def _attempt_connection(self) -> None:
         """Attempt MQTT connection with retry logic"""
         try:
+            self._connect_event.clear()
+            
             # Create MQTT client
             self.client = mqtt.Client(
                 client_id=self.config.client_id,
@@ -75,6 +100,11 @@ class MQTTPublisher:
             self.client.on_connect = self._on_connect
             self.client.on_disconnect = self._on_disconnect
             self.client.on_publish = self._on_publish
+            self.client.on_socket_open = self._on_socket_open
+            
+            # Let periodic publishes proceed without waiting on each PUBACK
+            self.client.max_inflight_messages_set(self.config.max_inflight_messages)
+            self.client.max_queued_messages_set(self.config.max_queued_messages)
             
             # Set authentication if provided
             if self.config.username and self.config.password:
@@ -89,7 +119,8 @@ class MQTTPublisher:
             
             # Connect to broker
             self.logger.info(
-                f"Attempting to connect to MQTT broker {self.config.broker}:{self.config.port}"
+                "Attempting to connect to MQTT broker %s:%s",
+                self.config.broker, self.config.port
             )
             
             self.client.connect(
@@ -101,17 +132,15 @@ class MQTTPublisher:
             # Start network loop
             self.client.loop_start()
             
-            # Wait for connection
-            timeout = 10
-            start_time = time.time()
-            while not self._connected and (time.time() - start_time) < timeout:
-                time.sleep(0.1)
+            # Wait for the broker's CONNACK
+            if not self._connect_event.wait(timeout=_CONNECT_TIMEOUT):
+                raise ConnectionError("MQTT connection timeout")
             
             if not self._connected:
-                raise ConnectionError("MQTT connection timeout")
+                raise ConnectionError("MQTT connection refused")
                 
         except Exception as e:
-            self.logger.error(f"MQTT connection attempt failed: {e}")
+            self.logger.error("MQTT connection attempt failed: %s", e)
             raise ConnectionError(f"MQTT connection failed: {e}")
     
     def _configure_tls(self) -> None:
@@ -119,18 +148,30 @@ class MQTTPublisher:
         if not self.client:
             return
         
-        tls_config = self.config.tls
+        if self._ssl_context is None:
+            self._ssl_context = self._build_ssl_context()
         
-        self.client.tls_set(
-            ca_certs=tls_config.ca_certs,
-            certfile=tls_config.certfile,
-            keyfile=tls_config.keyfile,
-            cert_reqs=ssl.CERT_REQUIRED,
-            tls_version=ssl.PROTOCOL_TLSv1_2
-        )
+        self.client.tls_set_context(self._ssl_context)
         
         self.logger.info("TLS/SSL configured for MQTT connection")
     
+    def _build_ssl_context(self) -> ssl.SSLContext:
+        """
+        Load CA and client certificates into an SSL context
+        
+        Returns:
+            SSL context requiring a verified broker certificate and TLS 1.2+
+        """
+        tls_config = self.config.tls
+        
+        context = ssl.create_default_context(cafile=tls_config.ca_certs)
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        
+        if tls_config.certfile:
+            context.load_cert_chain(tls_config.certfile, tls_config.keyfile)
+        
+        return context
+    
     def disconnect(self) -> None:
         """Disconnect from MQTT broker"""
         if self.client:
@@ -139,12 +180,17 @@ class MQTTPublisher:
             self._connected = False
             self.logger.info("Disconnected from MQTT broker")
     
-    def publish(self, message: TelemetryMessage) -> bool:
+    def publish(self, message: TelemetryMessage, qos: Optional[int] = None) -> bool:
         """
         Publish telemetry message to MQTT broker
         
+        QoS 0 avoids waiting on a PUBACK per message and roughly halves publish
+        latency, at the cost of losing messages dropped in transit. QoS 1 and 2
+        publishes are still queued asynchronously by paho's network thread.
+        
         Args:
             message: TelemetryMessage to publish
+            qos: Quality of Service (uses telemetry_qos, then qos, if not specified)
             
         Returns:
             True if publish successful
@@ -154,30 +200,123 @@ class MQTTPublisher:
             return False
         
         try:
-            # Convert message to JSON
-            payload = message.json()
-            
-            # Construct topic
-            topic = f"{self.config.topic_prefix}/telemetry"
+            # Serialize straight to bytes; paho sends them without re-encoding
+            return self._publish_telemetry(self._serialize(message), qos)
+        except Exception as e:
+            self.logger.error("Error publishing message: %s", e)
+            return False
+    
+    def publish_batch(
+        self,
+        messages: List[TelemetryMessage],
+        qos: Optional[int] = None
+    ) -> bool:
+        """
+        Publish several telemetry messages as one MQTT message
+        
+        The payload is {"batch": [message, ...]} with each message in the
+        configured payload_format, so N messages cost one PUBLISH packet (and
+        TLS record) instead of N.
+        
+        Args:
+            messages: TelemetryMessage objects to publish together
+            qos: Quality of Service (uses telemetry_qos, then qos, if not specified)
             
-            # Publish with QoS
-            result = self.client.publish(
-                topic,
-                payload,
-                qos=self.config.qos,
-                retain=False
+        Returns:
+            True if publish successful
+        """
+        if not self._connected or not self.client:
+            self.logger.error("Cannot publish: not connected to MQTT broker")
+            return False
+        
+        if not messages:
+            return True
+        
+        try:
+            # Splice the per-message JSON so batches match single publishes
+            payload = b'{"batch":[' + b','.join(map(self._serialize, messages)) + b']}'
+            return self._publish_telemetry(payload, qos)
+        except Exception as e:
+            self.logger.error("Error publishing message batch: %s", e)
+            return False
+    
+    def _publish_telemetry(self, payload: bytes, qos: Optional[int]) -> bool:
+        """Publish a serialized payload to the telemetry topic"""
+        if not self.client:
+            return False
+        
+        # Publish with QoS
+        qos_level = qos if qos is not None else self._telemetry_qos
+        result = self.client.publish(
+            self._telemetry_topic,
+            payload,
+            qos=qos_level,
+            retain=False
+        )
+        
+        if result.rc == mqtt.MQTT_ERR_SUCCESS:
+            if qos_level > 0:
+                self._track_unacked(result)
+            self.logger.debug("Published message to %s", self._telemetry_topic)
+            return True
+        elif result.rc == mqtt.MQTT_ERR_QUEUE_SIZE:
+            self.logger.warning(
+                "MQTT outgoing queue full (%s messages), dropping telemetry",
+                self.config.max_queued_messages
             )
+            return False
+        else:
+            self.logger.error("Failed to publish message: %s", result.rc)
+            return False
+    
+    def publish_reliable(self, message: TelemetryMessage) -> bool:
+        """
+        Publish a telemetry message that must not be lost (QoS 1)
+        
+        The call returns once paho has queued the message; delivery is
+        confirmed asynchronously by the network thread.
+        
+        Args:
+            message: TelemetryMessage to publish
             
-            if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                self.logger.debug(f"Published message to {topic}")
-                return True
-            else:
-                self.logger.error(f"Failed to publish message: {result.rc}")
+        Returns:
+            True if publish successful
+        """
+        return self.publish(message, qos=max(1, self._telemetry_qos))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all tracked QoS 1/2 publishes are acknowledged
+        
+        Lets callers confirm a whole batch of publishes at once instead of
+        blocking on each PUBACK.
+        
+        Args:
+            timeout: Maximum seconds to wait (waits indefinitely if not specified)
+            
+        Returns:
+            True if every tracked message was acknowledged in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while self._unacked:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self._unacked[0].wait_for_publish(remaining)
+            if not self._unacked[0].is_published():
+                self.logger.warning(
+                    "%s MQTT messages still unacknowledged", len(self._unacked)
+                )
                 return False
-                
-        except Exception as e:
-            self.logger.error(f"Error publishing message: {e}")
-            return False
+            self._unacked.popleft()
+        
+        return True
+    
+    def _track_unacked(self, info: mqtt.MQTTMessageInfo) -> None:
+        """Remember a QoS 1/2 publish and drop entries already acknowledged"""
+        unacked = self._unacked
+        while unacked and unacked[0].is_published():
+            unacked.popleft()
+        unacked.append(info)
     
     def publish_json(self, topic_suffix: str, data: dict, qos: Optional[int] = None) -> bool:
         """
@@ -196,38 +335,45 @@ class MQTTPublisher:
             return False
         
         try:
-            payload = json.dumps(data)
-            topic = f"{self.config.topic_prefix}/{topic_suffix}"
+            # orjson emits bytes, which paho sends without re-encoding
+            payload = orjson.dumps(data)
+            topic = self._topic_cache.get(topic_suffix)
+            if topic is None:
+                topic = f"{self.config.topic_prefix}/{topic_suffix}"
+                self._topic_cache[topic_suffix] = topic
             qos_level = qos if qos is not None else self.config.qos
             
             result = self.client.publish(topic, payload, qos=qos_level, retain=False)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                self.logger.debug(f"Published JSON to {topic}")
+                self.logger.debug("Published JSON to %s", topic)
                 return True
             else:
-                self.logger.error(f"Failed to publish JSON: {result.rc}")
+                self.logger.error("Failed to publish JSON: %s", result.rc)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error publishing JSON: {e}")
+            self.logger.error("Error publishing JSON: %s", e)
             return False
     
     def _on_connect(self, client, userdata, flags, rc):
         """Callback for successful MQTT connection"""
         if rc == 0:
             self._connected = True
-            self.logger.info(f"Connected to MQTT broker {self.config.broker}")
+            self.logger.info("Connected to MQTT broker %s", self.config.broker)
             
             # Trigger connection callbacks
             for callback in self._connection_callbacks:
                 try:
                     callback()
                 except Exception as e:
-                    self.logger.error(f"Error in connection callback: {e}")
+                    self.logger.error("Error in connection callback: %s", e)
         else:
-            self.logger.error(f"MQTT connection failed with code {rc}")
+            self.logger.error("MQTT connection failed with code %s", rc)
             self._connected = False
+        
+        # Wake the connecting thread either way; it checks _connected
+        self._connect_event.set()
     
     def _on_disconnect(self, client, userdata, rc):
         """Callback for MQTT disconnection"""
@@ -236,21 +382,28 @@ class MQTTPublisher:
         if rc == 0:
             self.logger.info("Cleanly disconnected from MQTT broker")
         else:
-            self.logger.warning(f"Unexpectedly disconnected from MQTT broker (code {rc})")
+            self.logger.warning("Unexpectedly disconnected from MQTT broker (code %s)", rc)
             
             # Trigger disconnection callbacks
             for callback in self._disconnection_callbacks:
                 try:
                     callback()
                 except Exception as e:
-                    self.logger.error(f"Error in disconnection callback: {e}")
+                    self.logger.error("Error in disconnection callback: %s", e)
             
             # Attempt reconnection with exponential backoff
             self._reconnect_with_backoff()
     
+    def _on_socket_open(self, client, userdata, sock):
+        """Callback for socket creation; disable Nagle for small telemetry payloads"""
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (OSError, AttributeError) as e:
+            self.logger.warning("Could not set TCP_NODELAY on MQTT socket: %s", e)
+    
     def _on_publish(self, client, userdata, mid):
         """Callback for successful publish"""
-        self.logger.debug(f"Message {mid} published successfully")
+        self.logger.debug("Message %s published successfully", mid)
     
     def _reconnect_with_backoff(self) -> None:
         """Reconnect to MQTT broker with exponential backoff"""
@@ -261,8 +414,8 @@ class MQTTPublisher:
         
         for attempt in range(max_retries):
             self.logger.info(
-                f"Reconnection attempt {attempt + 1}/{max_retries} "
-                f"after {delay}s delay"
+                "Reconnection attempt %s/%s after %ss delay",
+                attempt + 1, max_retries, delay
             )
             
             time.sleep(delay)
@@ -273,12 +426,12 @@ class MQTTPublisher:
                     self.logger.info("Reconnection successful")
                     return
             except Exception as e:
-                self.logger.warning(f"Reconnection attempt failed: {e}")
+                self.logger.warning("Reconnection attempt failed: %s", e)
             
             # Increase delay with exponential backoff
             delay = min(delay * multiplier, max_delay)
         
-        self.logger.error(f"Failed to reconnect after {max_retries} attempts")
+        self.logger.error("Failed to reconnect after %s attempts", max_retries)
     
     def add_connection_callback(self, callback: Callable) -> None:
         """Add callback to be called on successful connection"""
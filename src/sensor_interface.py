@@ -4,7 +4,8 @@ Defines abstract interfaces for sensor readers
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Any, Mapping, Optional
 from datetime import datetime
 from src.logger import get_logger
 
@@ -12,22 +13,22 @@ from src.logger import get_logger
 logger = get_logger(__name__)
 
 
+@dataclass(slots=True, eq=False)
 class SensorReading:
     """Represents a single sensor reading"""
     
-    def __init__(
-        self,
-        sensor_name: str,
-        value: float,
-        unit: str,
-        timestamp: Optional[datetime] = None,
-        metadata: Optional[Dict[str, Any]] = None
-    ):
-        self.sensor_name = sensor_name
-        self.value = value
-        self.unit = unit
-        self.timestamp = timestamp or datetime.utcnow()
-        self.metadata = metadata or {}
+    sensor_name: str
+    value: float
+    unit: str
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self) -> None:
+        # Callers of the original __init__ could pass None explicitly
+        if self.timestamp is None:
+            self.timestamp = datetime.utcnow()
+        if self.metadata is None:
+            self.metadata = {}
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert reading to dictionary"""
@@ -36,7 +37,8 @@ class SensorReading:
             'value': self.value,
             'unit': self.unit,
             'timestamp': self.timestamp.isoformat(),
-            'metadata': self.metadata
+            # Sensors share one read-only metadata mapping across readings
+            'metadata': dict(self.metadata)
         }
     
     def __repr__(self) -> str:
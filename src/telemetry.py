@@ -3,9 +3,15 @@ Data validation and normalization module
 Validates sensor readings against configured rules and normalizes data
 """
 
-from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator
+import math
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 from datetime import datetime
+import orjson
 from src.sensor_interface import SensorReading
 from src.config import ValidationRules, TelemetryConfig
 from src.logger import get_logger
@@ -13,34 +19,101 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# UUID4 version and RFC 4122 variant bits within a 128-bit integer
+_UUID4_CLEAR_MASK = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID4_SET_BITS = (0x4000 << 64) | (0x8000 << 48)
 
-class ValidatedReading(BaseModel):
+# (min, max) validation bounds; an unset side is -inf/+inf
+Bounds = Tuple[float, float]
+
+# (substring of lower-cased sensor name, sensor type), checked in order
+_SENSOR_TYPE_PATTERNS = (
+    ('temp', 'temperature'),
+    ('humid', 'humidity'),
+    ('press', 'pressure'),
+    ('light', 'light'),
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback for types it doesn't serialize natively"""
+    # Sensor metadata arrives as a read-only MappingProxyType
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+@dataclass(slots=True)
+class ValidatedReading:
     """Validated and normalized sensor reading"""
     sensor_name: str
     value: float
     unit: str
     timestamp: datetime
     device_id: Optional[str] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=dict)
     validation_status: str = "valid"  # valid, out_of_range, invalid
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert reading to a JSON-ready dictionary"""
+        return {
+            'sensor_name': self.sensor_name,
+            'value': self.value,
+            'unit': self.unit,
+            'timestamp': self.timestamp.isoformat(),
+            'device_id': self.device_id,
+            'metadata': dict(self.metadata),
+            'validation_status': self.validation_status
         }
 
 
-class TelemetryMessage(BaseModel):
+@dataclass(slots=True)
+class TelemetryMessage:
     """Normalized telemetry message for MQTT publishing"""
     device_id: str
     timestamp: datetime
     readings: List[ValidatedReading]
     message_id: Optional[str] = None
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert message to a JSON-ready dictionary"""
+        return {
+            'device_id': self.device_id,
+            'timestamp': self.timestamp.isoformat(),
+            'readings': [reading.to_dict() for reading in self.readings],
+            'message_id': self.message_id
         }
+    
+    def to_bytes(self) -> bytes:
+        """Serialize to UTF-8 JSON bytes without an intermediate dict or str"""
+        # orjson walks dataclasses and ISO-formats datetimes natively
+        return orjson.dumps(self, default=_json_default)
+    
+    def to_columnar_bytes(self) -> bytes:
+        """
+        Serialize to UTF-8 JSON bytes with readings as one array per field
+        
+        Field names are written once per message instead of once per reading,
+        which shrinks large batches. Reading device IDs are omitted since they
+        repeat the message's device_id.
+        
+        Returns:
+            JSON bytes
+        """
+        readings = self.readings
+        return orjson.dumps({
+            'device_id': self.device_id,
+            'timestamp': self.timestamp,
+            'readings': {
+                'sensor_name': [reading.sensor_name for reading in readings],
+                'value': [reading.value for reading in readings],
+                'unit': [reading.unit for reading in readings],
+                'timestamp': [reading.timestamp for reading in readings],
+                'metadata': [reading.metadata for reading in readings],
+                'validation_status': [reading.validation_status for reading in readings]
+            },
+            'message_id': self.message_id
+        }, default=_json_default)
 
 
 class DataValidator:
@@ -48,46 +121,131 @@ class DataValidator:
     
     def __init__(self, validation_rules: ValidationRules):
         self.rules = validation_rules
-        self.logger = get_logger(__name__)
+        # Rules are immutable, so flatten them to (min, max) per sensor type once
+        self._bounds_by_type: Dict[str, Bounds] = {
+            sensor_type: (rules.get('min', -math.inf), rules.get('max', math.inf))
+            for sensor_type, rules in validation_rules.model_dump().items()
+            if rules
+        }
+        # Sensor names come from config, so resolve each name's rules only once
+        self._rules_cache: Dict[str, Optional[Bounds]] = {}
+        # Only bumped on the out-of-range slow path
+        self._out_of_range_count = 0
+    
+    @property
+    def out_of_range_count(self) -> int:
+        """Number of readings found out of range by this validator"""
+        return self._out_of_range_count
     
-    def validate(self, reading: SensorReading) -> ValidatedReading:
+    def validate(
+        self,
+        reading: SensorReading,
+        device_id: Optional[str] = None
+    ) -> ValidatedReading:
         """
         Validate a sensor reading
         
         Args:
             reading: SensorReading to validate
+            device_id: Optional device ID to set on the validated reading
             
         Returns:
             ValidatedReading with validation status
         """
-        # Extract sensor type from name (e.g., "temperature_sensor" -> "temperature")
-        sensor_type = self._extract_sensor_type(reading.sensor_name)
+        return self._apply_rules(reading, self._rules_for(reading.sensor_name), device_id)
+    
+    def validate_batch(
+        self,
+        readings: List[SensorReading],
+        device_id: Optional[str] = None
+    ) -> List[ValidatedReading]:
+        """
+        Validate a batch of sensor readings
         
-        # Get validation rules for this sensor type
-        rules = self._get_rules(sensor_type)
+        Args:
+            readings: List of SensorReading objects to validate
+            device_id: Optional device ID to set on every validated reading
+            
+        Returns:
+            List of ValidatedReading objects, in input order
+        """
+        rules_cache = self._rules_cache
+        rules_for = self._rules_for
+        apply_rules = self._apply_rules
+        validated: List[ValidatedReading] = []
+        append = validated.append
+        
+        for reading in readings:
+            name = reading.sensor_name
+            try:
+                rules = rules_cache[name]
+            except KeyError:
+                rules = rules_for(name)
+            
+            value = reading.value
+            # Fast path: in-range or unchecked readings need no status or
+            # warning logic, so build them inline
+            if rules is None or rules[0] <= value <= rules[1]:
+                append(ValidatedReading(
+                    sensor_name=name,
+                    value=value,
+                    unit=reading.unit,
+                    timestamp=reading.timestamp,
+                    device_id=device_id,
+                    metadata=reading.metadata
+                ))
+            else:
+                append(apply_rules(reading, rules, device_id))
         
+        return validated
+    
+    def _rules_for(self, sensor_name: str) -> Optional[Bounds]:
+        """Get validation rules for a sensor name, resolving them on first use"""
+        try:
+            return self._rules_cache[sensor_name]
+        except KeyError:
+            # Extract sensor type from name (e.g., "temperature_sensor" -> "temperature")
+            rules = self._get_rules(self._extract_sensor_type(sensor_name))
+            self._rules_cache[sensor_name] = rules
+            return rules
+    
+    def _apply_rules(
+        self,
+        reading: SensorReading,
+        rules: Optional[Bounds],
+        device_id: Optional[str] = None
+    ) -> ValidatedReading:
+        """Check a reading against resolved bounds and build the validated reading"""
         validation_status = "valid"
+        value = reading.value
         
         if rules:
-            min_val = rules.get('min')
-            max_val = rules.get('max')
+            min_val, max_val = rules
             
-            if min_val is not None and reading.value < min_val:
-                validation_status = "out_of_range"
-                self.logger.warning(
-                    f"{reading.sensor_name} value {reading.value} below minimum {min_val}"
-                )
-            elif max_val is not None and reading.value > max_val:
-                validation_status = "out_of_range"
-                self.logger.warning(
-                    f"{reading.sensor_name} value {reading.value} above maximum {max_val}"
-                )
+            # A single chained comparison covers the common in-range case
+            if not min_val <= value <= max_val:
+                # Lazy %-formatting: no message is built when WARNING is disabled
+                if value < min_val:
+                    validation_status = "out_of_range"
+                    self._out_of_range_count += 1
+                    logger.warning(
+                        "%s value %s below minimum %s",
+                        reading.sensor_name, value, min_val
+                    )
+                elif value > max_val:
+                    validation_status = "out_of_range"
+                    self._out_of_range_count += 1
+                    logger.warning(
+                        "%s value %s above maximum %s",
+                        reading.sensor_name, value, max_val
+                    )
         
         return ValidatedReading(
             sensor_name=reading.sensor_name,
-            value=reading.value,
+            value=value,
             unit=reading.unit,
             timestamp=reading.timestamp,
+            device_id=device_id,
             metadata=reading.metadata,
             validation_status=validation_status
         )
@@ -97,21 +255,15 @@ class DataValidator:
         # Try to match common sensor types
         name_lower = sensor_name.lower()
         
-        if 'temp' in name_lower:
-            return 'temperature'
-        elif 'humid' in name_lower:
-            return 'humidity'
-        elif 'pressure' in name_lower or 'press' in name_lower:
-            return 'pressure'
-        elif 'light' in name_lower:
-            return 'light'
+        for pattern, sensor_type in _SENSOR_TYPE_PATTERNS:
+            if pattern in name_lower:
+                return sensor_type
         
         return sensor_name
     
-    def _get_rules(self, sensor_type: str) -> Optional[Dict[str, float]]:
-        """Get validation rules for a sensor type"""
-        rules_dict = self.rules.dict()
-        return rules_dict.get(sensor_type)
+    def _get_rules(self, sensor_type: str) -> Optional[Bounds]:
+        """Get (min, max) validation bounds for a sensor type"""
+        return self._bounds_by_type.get(sensor_type)
 
 
 class TelemetryNormalizer:
@@ -119,59 +271,119 @@ class TelemetryNormalizer:
     
     def __init__(self, telemetry_config: TelemetryConfig):
         self.config = telemetry_config
-        self.logger = get_logger(__name__)
         self._batch: List[ValidatedReading] = []
+        # Monotonic time the current batch received its first reading
+        self._batch_started = 0.0
+        # Guards the batch so several reader threads can feed one normalizer;
+        # flushing swaps the list out under the lock instead of copying it
+        self._batch_lock = threading.Lock()
+        # Message IDs only need to be unique, not secret, so a urandom-seeded
+        # PRNG replaces a syscall per ID
+        self._id_rng = random.Random(os.urandom(32))
+        # Config is fixed for the normalizer's lifetime, so resolve the
+        # per-reading flags once instead of on every call
+        self._device_id = (
+            telemetry_config.device_id if telemetry_config.include_device_id else None
+        )
+        self._batch_size = (
+            telemetry_config.batch_size if telemetry_config.batch_enabled else 0
+        )
+        self._include_timestamp = telemetry_config.include_timestamp
     
-    def add_reading(self, reading: ValidatedReading) -> Optional[TelemetryMessage]:
+    def add_reading(
+        self,
+        reading: ValidatedReading,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[TelemetryMessage]:
         """
         Add a validated reading and optionally return a message
         
         Args:
             reading: ValidatedReading to add
+            timestamp: Optional message timestamp (defaults to now)
             
         Returns:
             TelemetryMessage if ready to send, None otherwise
         """
-        # Add device ID if configured
-        if self.config.include_device_id:
-            reading.device_id = self.config.device_id
+        # Stamp the configured device ID, replacing any stale or foreign one
+        if self._device_id is not None:
+            reading.device_id = self._device_id
         
-        if self.config.batch_enabled:
-            self._batch.append(reading)
+        if self._batch_size:
+            with self._batch_lock:
+                batch = self._batch
+                if not batch:
+                    self._batch_started = time.monotonic()
+                batch.append(reading)
+                
+                if len(batch) < self._batch_size:
+                    return None
+                self._batch = []
             
-            if len(self._batch) >= self.config.batch_size:
-                return self._create_message()
-            return None
+            return self._create_message(batch, timestamp)
         else:
             # Single reading mode
-            return self._create_message([reading])
+            return self._create_message([reading], timestamp)
     
-    def flush(self) -> Optional[TelemetryMessage]:
+    def flush(self, timestamp: Optional[datetime] = None) -> Optional[TelemetryMessage]:
         """
         Flush any pending readings
         
+        Args:
+            timestamp: Optional message timestamp (defaults to now)
+            
         Returns:
             TelemetryMessage with remaining readings, or None if empty
         """
-        if self._batch:
-            return self._create_message()
-        return None
+        with self._batch_lock:
+            batch = self._batch
+            if not batch:
+                return None
+            self._batch = []
+        
+        return self._create_message(batch, timestamp)
+    
+    def flush_if_due(self, timestamp: Optional[datetime] = None) -> Optional[TelemetryMessage]:
+        """
+        Flush pending readings once the batch has been open batch_max_latency seconds
+        
+        With the default latency of 0 this flushes whenever readings are pending.
+        
+        Args:
+            timestamp: Optional message timestamp (defaults to now)
+            
+        Returns:
+            TelemetryMessage with pending readings, or None if empty or not yet due
+        """
+        with self._batch_lock:
+            batch = self._batch
+            if not batch or (
+                time.monotonic() - self._batch_started < self.config.batch_max_latency
+            ):
+                return None
+            self._batch = []
+        
+        return self._create_message(batch, timestamp)
     
-    def _create_message(self, readings: Optional[List[ValidatedReading]] = None) -> TelemetryMessage:
+    def _create_message(
+        self,
+        readings: List[ValidatedReading],
+        timestamp: Optional[datetime] = None
+    ) -> TelemetryMessage:
         """
         Create a telemetry message
         
         Args:
-            readings: Optional list of readings (uses batch if not provided)
+            readings: Readings to include; the message takes ownership of the list
+            timestamp: Optional message timestamp (defaults to now)
             
         Returns:
             TelemetryMessage
         """
-        if readings is None:
-            readings = self._batch.copy()
-            self._batch.clear()
-        
-        timestamp = datetime.utcnow() if self.config.include_timestamp else readings[0].timestamp
+        if not self._include_timestamp:
+            timestamp = readings[0].timestamp
+        elif timestamp is None:
+            timestamp = datetime.utcnow()
         
         message = TelemetryMessage(
             device_id=self.config.device_id,
@@ -180,14 +392,17 @@ class TelemetryNormalizer:
             message_id=self._generate_message_id()
         )
         
-        self.logger.debug(f"Created telemetry message with {len(readings)} readings")
+        logger.debug("Created telemetry message with %s readings", len(readings))
         
         return message
     
     def _generate_message_id(self) -> str:
-        """Generate a unique message ID"""
-        import uuid
-        return str(uuid.uuid4())
+        """Generate a unique message ID (random UUID4)"""
+        bits = (self._id_rng.getrandbits(128) & _UUID4_CLEAR_MASK) | _UUID4_SET_BITS
+        
+        # Format the canonical 8-4-4-4-12 form directly, skipping uuid.UUID
+        hex_id = '%032x' % bits
+        return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
 
 
 class TelemetryProcessor:
@@ -196,45 +411,65 @@ class TelemetryProcessor:
     def __init__(self, validation_rules: ValidationRules, telemetry_config: TelemetryConfig):
         self.validator = DataValidator(validation_rules)
         self.normalizer = TelemetryNormalizer(telemetry_config)
-        self.logger = get_logger(__name__)
+        # Set on each reading as it is built so the normalizer doesn't patch it later
+        self._device_id = (
+            telemetry_config.device_id if telemetry_config.include_device_id else None
+        )
     
-    def process_reading(self, reading: SensorReading) -> Optional[TelemetryMessage]:
+    def process_reading(
+        self,
+        reading: SensorReading,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[TelemetryMessage]:
         """
         Process a sensor reading through validation and normalization
         
         Args:
             reading: SensorReading to process
+            timestamp: Optional message timestamp (defaults to now)
             
         Returns:
             TelemetryMessage if ready to send, None otherwise
         """
         # Validate
-        validated = self.validator.validate(reading)
+        validated = self.validator.validate(reading, self._device_id)
         
         # Normalize
-        message = self.normalizer.add_reading(validated)
+        message = self.normalizer.add_reading(validated, timestamp)
         
         return message
     
-    def process_readings(self, readings: List[SensorReading]) -> List[TelemetryMessage]:
+    def process_readings(
+        self,
+        readings: List[SensorReading],
+        timestamp: Optional[datetime] = None
+    ) -> List[TelemetryMessage]:
         """
         Process multiple sensor readings
         
         Args:
             readings: List of SensorReading objects
+            timestamp: Optional timestamp shared by every message produced
+                (taken once per call if not provided)
             
         Returns:
             List of TelemetryMessage objects ready to send
         """
         messages = []
         
-        for reading in readings:
-            message = self.process_reading(reading)
+        if timestamp is None:
+            timestamp = datetime.utcnow()
+        
+        # Validate the whole batch first so rule lookups and method binding
+        # happen once per call rather than once per reading
+        add_reading = self.normalizer.add_reading
+        for validated in self.validator.validate_batch(readings, self._device_id):
+            message = add_reading(validated, timestamp)
             if message:
                 messages.append(message)
         
-        # Flush any remaining readings
-        final_message = self.normalizer.flush()
+        # Flush remaining readings unless the batch may still span more polls
+        final_message = self.normalizer.flush_if_due(timestamp)
         if final_message:
             messages.append(final_message)
         
@@ -87,3 +87,30 @@ def test_load_config_file_not_found():
     """Test loading non-existent config file"""
     with pytest.raises(FileNotFoundError):
         load_config("nonexistent.yaml")
+
+
+def test_load_config_cached(tmp_path):
+    """Test that an unchanged config file is only parsed once"""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text((Path(__file__).parent.parent / "config.yaml").read_text())
+    
+    first = load_config(str(config_file))
+    second = load_config(str(config_file))
+    
+    assert first is second
+
+
+def test_load_config_nested_models_frozen(tmp_path):
+    """Test that the shared cached config rejects nested mutation"""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text((Path(__file__).parent.parent / "config.yaml").read_text())
+    
+    config = load_config(str(config_file))
+    
+    with pytest.raises(ValidationError):
+        config.telemetry.batch_size = 99
+    with pytest.raises(ValidationError):
+        config.mqtt.reconnect.max_retries = 1
+    with pytest.raises(AttributeError):
+        config.modbus.sensors.append(None)
+    assert load_config(str(config_file)).telemetry.batch_size == config.telemetry.batch_size
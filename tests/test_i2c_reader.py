@@ -2,6 +2,8 @@
 Unit tests for I2C reader
 """
 
+import ctypes
+import errno
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from src.i2c_reader import I2CSensor, I2CReader
@@ -56,7 +58,7 @@ def test_i2c_sensor_parse_bh1750():
     
     # BH1750 returns 16-bit value, divide by 1.2 for lux
     # Example: 300 lux = 360 raw value
-    data = [0x01, 0x68]  # 360 in big-endian
+    data = bytes([0x01, 0x68])  # 360 in big-endian
     result = sensor._parse_data(data)
     
     expected_lux = 360 / 1.2
@@ -78,7 +80,7 @@ def test_i2c_sensor_parse_bmp280():
     sensor = I2CSensor(config, mock_bus)
     
     # Sample pressure data (simplified, actual requires calibration)
-    data = [0x50, 0x00, 0x00, 0x00, 0x00, 0x00]
+    data = bytes([0x50, 0x00, 0x00, 0x00, 0x00, 0x00])
     result = sensor._parse_data(data)
     
     assert result is not None
@@ -99,7 +101,7 @@ def test_i2c_sensor_parse_generic():
     
     sensor = I2CSensor(config, mock_bus)
     
-    data = [0x12, 0x34]  # 0x1234 = 4660
+    data = bytes([0x12, 0x34])  # 0x1234 = 4660
     result = sensor._parse_data(data)
     
     assert result == 4660.0
@@ -120,7 +122,7 @@ def test_i2c_sensor_parse_insufficient_data():
     sensor = I2CSensor(config, mock_bus)
     
     # Insufficient data
-    data = [0x12]
+    data = bytes([0x12])
     result = sensor._parse_data(data)
     
     assert result is None
@@ -154,11 +156,19 @@ def test_i2c_reader_disconnect(mock_smbus_class, i2c_config):
     assert len(reader.sensors) == 0
 
 
+def fill_read_messages(data):
+    """Build an i2c_rdwr side effect that copies data into every read message"""
+    def _rdwr(*msgs):
+        for msg in msgs[1::2]:
+            ctypes.memmove(msg.buf, bytes(data), len(data))
+    return _rdwr
+
+
 @patch('src.i2c_reader.SMBus')
 def test_i2c_reader_read_all(mock_smbus_class, i2c_config):
     """Test reading all I2C sensors"""
     mock_bus = MagicMock()
-    mock_bus.read_i2c_block_data.return_value = [0x01, 0x68]
+    mock_bus.i2c_rdwr.side_effect = fill_read_messages([0x01, 0x68])
     mock_smbus_class.return_value = mock_bus
     
     reader = I2CReader(i2c_config)
@@ -168,3 +178,83 @@ def test_i2c_reader_read_all(mock_smbus_class, i2c_config):
     
     assert len(readings) == 1
     assert readings[0].sensor_name == "light_sensor"
+    assert abs(readings[0].value - 360 / 1.2) < 0.1
+    mock_bus.i2c_rdwr.assert_called_once()
+    mock_bus.read_i2c_block_data.assert_not_called()
+    assert readings[0].metadata == {
+        'address': '0x23',
+        'sensor_type': 'BH1750',
+        'register': '0x10'
+    }
+    with pytest.raises(TypeError):
+        readings[0].metadata['extra'] = True
+
+
+@patch('src.i2c_reader.SMBus')
+def test_i2c_reader_read_all_skips_failed_transfer(mock_smbus_class, i2c_config):
+    """Test that a failed bus transfer drops only that sensor's reading"""
+    mock_bus = MagicMock()
+    mock_bus.i2c_rdwr.side_effect = OSError("Remote I/O error")
+    mock_bus.read_i2c_block_data.side_effect = OSError("Remote I/O error")
+    mock_smbus_class.return_value = mock_bus
+    
+    reader = I2CReader(i2c_config)
+    reader.connect()
+    
+    readings = reader.read_all()
+    
+    assert readings == []
+
+
+@patch('src.i2c_reader.SMBus')
+def test_i2c_reader_read_all_falls_back_to_single_reads(mock_smbus_class, i2c_config):
+    """Test per-sensor reads when the combined transfer is rejected"""
+    mock_bus = MagicMock()
+    mock_bus.i2c_rdwr.side_effect = OSError(errno.EOPNOTSUPP, "Operation not supported")
+    mock_bus.read_i2c_block_data.return_value = [0x01, 0x68]
+    mock_smbus_class.return_value = mock_bus
+    
+    reader = I2CReader(i2c_config)
+    reader.connect()
+    
+    readings = reader.read_all()
+    
+    assert len(readings) == 1
+    mock_bus.read_i2c_block_data.assert_called_once_with(0x23, 0x10, 2)
+    
+    # The rejection is remembered, so later polls skip the combined transfer
+    assert len(reader.read_all()) == 1
+    mock_bus.i2c_rdwr.assert_called_once()
+    assert mock_bus.read_i2c_block_data.call_count == 2
+
+
+@patch('src.i2c_reader.SMBus')
+def test_i2c_reader_read_all_retries_combined_after_transient_failure(
+    mock_smbus_class, i2c_config
+):
+    """Test that a device NACK only falls back for the cycle it happened in"""
+    mock_bus = MagicMock()
+    mock_bus.i2c_rdwr.side_effect = [OSError(errno.EREMOTEIO, "Remote I/O error"), None]
+    mock_bus.read_i2c_block_data.return_value = [0x01, 0x68]
+    mock_smbus_class.return_value = mock_bus
+    
+    reader = I2CReader(i2c_config)
+    reader.connect()
+    
+    assert len(reader.read_all()) == 1
+    mock_bus.read_i2c_block_data.assert_called_once()
+    
+    reader.read_all()
+    
+    assert mock_bus.i2c_rdwr.call_count == 2
+    mock_bus.read_i2c_block_data.assert_called_once()
+
+
+def test_i2c_reader_read_all_without_bus(i2c_config):
+    """Test that reading before connect() skips the combined transfer"""
+    reader = I2CReader(i2c_config)
+    reader.sensors = [I2CSensor(i2c_config.sensors[0], None)]
+    reader._build_transfers()
+    
+    assert reader.read_all() == []
+    assert reader._combined_supported
@@ -0,0 +1,117 @@
+"""
+Unit tests for logging configuration
+"""
+
+import json
+import logging
+import sys
+from src.logger import CustomJsonFormatter, setup_logging, shutdown_logging
+
+
+def make_record(msg="value=%s", args=(42,), exc_info=None):
+    """Create a log record for formatter tests"""
+    return logging.LogRecord(
+        name="test.logger",
+        level=logging.WARNING,
+        pathname=__file__,
+        lineno=10,
+        msg=msg,
+        args=args,
+        exc_info=exc_info,
+        func="test_function"
+    )
+
+
+def test_json_formatter_fields():
+    """Test that formatted records are JSON with the expected fields"""
+    formatter = CustomJsonFormatter()
+    
+    output = json.loads(formatter.format(make_record()))
+    
+    assert output['message'] == "value=42"
+    assert output['level'] == "WARNING"
+    assert output['logger'] == "test.logger"
+    assert output['function'] == "test_function"
+    assert 'timestamp' in output
+
+
+def test_json_formatter_cached_time_matches_default():
+    """Test that the cached timestamp matches logging's default format"""
+    formatter = CustomJsonFormatter()
+    reference = logging.Formatter()
+    
+    first = make_record()
+    second = make_record()
+    second.created = first.created + 0.5
+    second.msecs = (second.created - int(second.created)) * 1000
+    
+    for record in (first, second):
+        assert formatter.formatTime(record) == reference.formatTime(record)
+
+
+def test_json_formatter_honours_datefmt():
+    """Test that a datefmt given to the formatter is used for timestamps"""
+    formatter = CustomJsonFormatter(datefmt="%Y")
+    record = make_record()
+    
+    output = json.loads(formatter.format(record))
+    
+    assert output['timestamp'] == logging.Formatter(datefmt="%Y").formatTime(record, "%Y")
+
+
+def test_json_formatter_exception():
+    """Test that exception tracebacks are included"""
+    formatter = CustomJsonFormatter()
+    
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record(exc_info=sys.exc_info())
+    
+    output = json.loads(formatter.format(record))
+    
+    assert "ValueError: boom" in output['exc_info']
+
+
+def test_setup_logging_level():
+    """Test logger level configuration"""
+    logger = setup_logging(log_level="DEBUG", app_name="test-app")
+    
+    assert logger.level == logging.DEBUG
+    shutdown_logging("test-app")
+
+
+def test_setup_logging_writes_through_queue(tmp_path):
+    """Test that records reach the file handler via the background listener"""
+    log_file = tmp_path / "logs" / "app.log"
+    logger = setup_logging(log_level="INFO", log_file=str(log_file), app_name="test-queue")
+    
+    assert len(logger.handlers) == 1
+    
+    try:
+        raise RuntimeError("sensor failure")
+    except RuntimeError:
+        logger.error("Read failed for %s", "temp_sensor", exc_info=True)
+    
+    shutdown_logging("test-queue")
+    
+    output = json.loads(log_file.read_text().strip())
+    assert output['message'] == "Read failed for temp_sensor"
+    assert "RuntimeError: sensor failure" in output['exc_info']
+
+
+def test_setup_logging_is_idempotent():
+    """Test that repeat setup with the same settings keeps the handlers"""
+    first = setup_logging(log_level="info", app_name="test-idempotent")
+    handler = first.handlers[0]
+    
+    second = setup_logging(log_level="INFO", app_name="test-idempotent")
+    assert second is first
+    assert second.handlers == [handler]
+    
+    # Changing the level reconfigures the logger
+    third = setup_logging(log_level="WARNING", app_name="test-idempotent")
+    assert third.level == logging.WARNING
+    assert third.handlers[0] is not handler
+    
+    shutdown_logging("test-idempotent")
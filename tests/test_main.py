@@ -0,0 +1,142 @@
+"""
+Unit tests for the main application orchestrator
+"""
+
+import asyncio
+import logging
+import signal
+import threading
+import time
+import pytest
+from collections import deque
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from src.main import IoTEdgeDevice
+from src.telemetry import TelemetryMessage, ValidatedReading
+from datetime import datetime
+
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.yaml"
+
+
+def make_message(value):
+    """Create a single-reading telemetry message"""
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    reading = ValidatedReading(
+        sensor_name="test_sensor",
+        value=value,
+        unit="celsius",
+        timestamp=timestamp
+    )
+    
+    return TelemetryMessage(
+        device_id="test-device",
+        timestamp=timestamp,
+        readings=[reading]
+    )
+
+
+@pytest.fixture
+def device():
+    """Create a device with mocked publisher and readers"""
+    with patch('src.main.setup_logging', return_value=logging.getLogger('test-main')), \
+            patch('src.main.shutdown_logging'), \
+            patch('src.main.signal.signal'):
+        app = IoTEdgeDevice(str(CONFIG_PATH))
+        app.mqtt_publisher = MagicMock()
+        app.mqtt_publisher.publish_batch.return_value = True
+        app.modbus_reader = MagicMock()
+        app.i2c_reader = MagicMock()
+        
+        yield app
+        
+        app.stop()
+
+
+def published_messages(publisher):
+    """Flatten every message passed to publish_batch"""
+    return [
+        message
+        for call in publisher.publish_batch.call_args_list
+        for message in call[0][0]
+    ]
+
+
+def test_drain_publishes_backlog_as_one_batch(device):
+    """Test that everything queued goes out in a single publish_batch"""
+    messages = [make_message(value) for value in (1.0, 2.0, 3.0)]
+    device._enqueue_tx(messages)
+    
+    # Not running, so the drain returns once the queue is empty
+    device._drain_tx()
+    
+    device.mqtt_publisher.publish_batch.assert_called_once_with(messages)
+    assert not device._tx_queue
+
+
+def test_stop_drains_queued_messages(device):
+    """Test that stop() publishes messages still queued"""
+    device._tx_running = True
+    device._tx_thread = threading.Thread(target=device._drain_tx, daemon=True)
+    device._tx_thread.start()
+    
+    messages = [make_message(value) for value in (1.0, 2.0, 3.0)]
+    device._enqueue_tx(messages)
+    device.stop()
+    
+    assert not device._tx_thread.is_alive()
+    assert published_messages(device.mqtt_publisher) == messages
+    assert not device._tx_queue
+
+
+def test_enqueue_overflow_drops_oldest(device):
+    """Test that a full queue drops its oldest messages and counts them"""
+    device._tx_queue = deque(maxlen=2)
+    messages = [make_message(value) for value in (1.0, 2.0, 3.0)]
+    
+    with patch('src.main._TX_QUEUE_SIZE', 2):
+        device._enqueue_tx(messages)
+    
+    assert list(device._tx_queue) == messages[1:]
+    assert device._tx_dropped == 1
+    
+    device._drain_tx()
+    
+    device.mqtt_publisher.publish_batch.assert_called_once_with(messages[1:])
+    assert device._tx_dropped == 0
+
+
+def test_stop_idempotent(device):
+    """Test that calling stop() twice cleans up only once"""
+    with patch('src.main.shutdown_logging') as mock_shutdown_logging:
+        device.stop()
+        device.stop()
+    
+    device.mqtt_publisher.disconnect.assert_called_once()
+    device.modbus_reader.disconnect.assert_called_once()
+    device.i2c_reader.disconnect.assert_called_once()
+    mock_shutdown_logging.assert_called_once()
+
+
+def test_signal_wakes_run_loop(device):
+    """Test that a signal ends the inter-poll wait through stop_event"""
+    polls = []
+    
+    async def poll_sensors():
+        polls.append(time.monotonic())
+        # Deliver the signal on the loop's thread, as the interpreter does
+        asyncio.get_running_loop().call_later(
+            0.05, device._signal_handler, signal.SIGTERM, None
+        )
+    
+    device._poll_sensors = poll_sensors
+    device._running = True
+    
+    start = time.monotonic()
+    asyncio.run(device._run_loop())
+    elapsed = time.monotonic() - start
+    
+    assert len(polls) == 1
+    assert elapsed < device.config.application.poll_interval / 2
+    assert device._stop_event is None
+    assert device._loop is None
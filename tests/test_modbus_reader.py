@@ -5,6 +5,7 @@ Unit tests for Modbus reader
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 import struct
+from datetime import datetime
 from src.modbus_reader import ModbusSensor, ModbusReader
 from src.config import ModbusConfig, ModbusSensorConfig
 
@@ -135,6 +136,63 @@ def test_modbus_sensor_parse_insufficient_registers():
     assert result is None
 
 
+def test_modbus_sensor_parse_32bit_integers():
+    """Test parsing int32 and uint32 data"""
+    mock_client = MagicMock()
+    reg1, reg2 = struct.unpack('>HH', struct.pack('>i', -123456))
+    
+    for data_type, expected in (("int32", -123456.0), ("uint32", float(2**32 - 123456))):
+        config = ModbusSensorConfig(
+            name="test",
+            slave_id=1,
+            register_address=0,
+            register_count=2,
+            data_type=data_type,
+            scaling_factor=1.0,
+            unit="test"
+        )
+        sensor = ModbusSensor(config, mock_client)
+        
+        assert sensor._parse_registers([reg1, reg2]) == expected
+
+
+def test_modbus_sensor_parse_unsupported_type():
+    """Test parsing with an unsupported data type"""
+    mock_client = MagicMock()
+    config = ModbusSensorConfig(
+        name="test",
+        slave_id=1,
+        register_address=0,
+        register_count=1,
+        data_type="int64",
+        scaling_factor=1.0,
+        unit="test"
+    )
+    
+    sensor = ModbusSensor(config, mock_client)
+    
+    assert sensor._parse_registers([1, 2, 3, 4]) is None
+
+
+def test_modbus_sensor_decode_reuses_metadata(modbus_sensor_config):
+    """Test decoded readings are scaled and share the cached metadata"""
+    sensor = ModbusSensor(modbus_sensor_config, MagicMock())
+    
+    first = sensor.decode(float_registers(10.0))
+    second = sensor.decode(float_registers(20.0))
+    
+    assert first.value == pytest.approx(10.0 * modbus_sensor_config.scaling_factor)
+    assert first.unit == modbus_sensor_config.unit
+    assert first.metadata == {
+        'slave_id': modbus_sensor_config.slave_id,
+        'register_address': modbus_sensor_config.register_address,
+        'data_type': modbus_sensor_config.data_type
+    }
+    assert first.metadata is second.metadata
+    with pytest.raises(TypeError):
+        first.metadata['extra'] = True
+
+
 @patch('src.modbus_reader.ModbusSerialClient')
 def test_modbus_reader_connect(mock_client_class, modbus_config):
     """Test Modbus reader connection"""
@@ -177,3 +235,88 @@ def test_modbus_reader_disconnect(mock_client_class, modbus_config):
     
     mock_client.close.assert_called_once()
     assert len(reader.sensors) == 0
+
+
+def make_block_config():
+    """Create a config with two contiguous sensors and one on another slave"""
+    def sensor(name, slave_id, address):
+        return ModbusSensorConfig(
+            name=name,
+            slave_id=slave_id,
+            register_address=address,
+            register_count=2,
+            data_type="float32",
+            scaling_factor=1.0,
+            unit="test"
+        )
+    
+    return ModbusConfig(
+        port="/dev/ttyUSB0",
+        sensors=[
+            sensor("temp_sensor", 1, 0),
+            sensor("humidity_sensor", 1, 2),
+            sensor("other_sensor", 2, 0)
+        ]
+    )
+
+
+def float_registers(*values):
+    """Pack float32 values into big-endian register pairs"""
+    registers = []
+    for value in values:
+        registers.extend(struct.unpack('>HH', struct.pack('>f', value)))
+    return registers
+
+
+@patch('src.modbus_reader.ModbusSerialClient')
+def test_modbus_reader_read_all_coalesces_contiguous_registers(mock_client_class):
+    """Test one register read per contiguous block on the same slave"""
+    mock_client = MagicMock()
+    mock_client.connect.return_value = True
+    mock_client.connected = True
+    mock_client_class.return_value = mock_client
+    
+    def read_holding_registers(address, count, slave):
+        result = MagicMock()
+        result.isError.return_value = False
+        result.registers = float_registers(25.0, 60.0) if slave == 1 else float_registers(1.5)
+        return result
+    
+    mock_client.read_holding_registers.side_effect = read_holding_registers
+    
+    reader = ModbusReader(make_block_config())
+    reader.connect()
+    poll_time = datetime(2024, 1, 1, 12, 0, 0)
+    readings = reader.read_all(timestamp=poll_time)
+    
+    assert [r.sensor_name for r in readings] == [
+        "temp_sensor", "humidity_sensor", "other_sensor"
+    ]
+    assert [r.value for r in readings] == [25.0, 60.0, 1.5]
+    assert all(r.timestamp == poll_time for r in readings)
+    assert mock_client.read_holding_registers.call_count == 2
+    mock_client.read_holding_registers.assert_any_call(address=0, count=4, slave=1)
+
+
+@patch('src.modbus_reader.ModbusSerialClient')
+def test_modbus_reader_read_all_block_failure_falls_back(mock_client_class):
+    """Test per-sensor reads when a coalesced block read fails"""
+    mock_client = MagicMock()
+    mock_client.connect.return_value = True
+    mock_client.connected = True
+    mock_client_class.return_value = mock_client
+    
+    def read_holding_registers(address, count, slave):
+        result = MagicMock()
+        result.isError.return_value = count > 2
+        result.registers = float_registers(10.0)
+        return result
+    
+    mock_client.read_holding_registers.side_effect = read_holding_registers
+    
+    reader = ModbusReader(make_block_config())
+    reader.connect()
+    readings = reader.read_all()
+    
+    assert len(readings) == 3
+    assert mock_client.read_holding_registers.call_count == 4
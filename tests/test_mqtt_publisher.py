@@ -2,11 +2,14 @@
 Unit tests for MQTT publisher
 """
 
+import json
+import socket
+import ssl
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 import paho.mqtt.client as mqtt
 from src.mqtt_publisher import MQTTPublisher
-from src.config import MQTTConfig, ReconnectConfig
+from src.config import MQTTConfig, ReconnectConfig, TLSConfig
 from src.telemetry import TelemetryMessage, ValidatedReading
 from datetime import datetime
 
@@ -30,19 +33,20 @@ def mqtt_config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def telemetry_message():
-    """Create a sample telemetry message"""
+    """Create a sample telemetry message shared by the module's tests"""
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
     reading = ValidatedReading(
         sensor_name="test_sensor",
         value=25.5,
         unit="celsius",
-        timestamp=datetime.utcnow()
+        timestamp=timestamp
     )
     
     return TelemetryMessage(
         device_id="test-device",
-        timestamp=datetime.utcnow(),
+        timestamp=timestamp,
         readings=[reading]
     )
 
@@ -92,6 +96,123 @@ def test_mqtt_publisher_publish(mock_client_class, mqtt_config, telemetry_messag
     
     assert success
     mock_client.publish.assert_called_once()
+    
+    topic, payload = mock_client.publish.call_args[0]
+    assert topic == "test/topic/telemetry"
+    assert isinstance(payload, bytes)
+    assert json.loads(payload)['device_id'] == "test-device"
+    assert mock_client.publish.call_args[1]['qos'] == 1
+
+
+def test_mqtt_publisher_telemetry_qos(mqtt_config, telemetry_message):
+    """Test telemetry QoS override and reliable publishing"""
+    config = mqtt_config.model_copy(update={'telemetry_qos': 0})
+    mock_client = MagicMock()
+    mock_client.publish.return_value.rc = mqtt.MQTT_ERR_SUCCESS
+    
+    publisher = MQTTPublisher(config)
+    publisher.client = mock_client
+    publisher._connected = True
+    
+    assert publisher.publish(telemetry_message)
+    assert mock_client.publish.call_args[1]['qos'] == 0
+    
+    assert publisher.publish(telemetry_message, qos=2)
+    assert mock_client.publish.call_args[1]['qos'] == 2
+    
+    assert publisher.publish_reliable(telemetry_message)
+    assert mock_client.publish.call_args[1]['qos'] == 1
+
+
+def test_mqtt_publisher_publish_columnar(mqtt_config, telemetry_message):
+    """Test publishing with the columnar payload format"""
+    config = mqtt_config.model_copy(update={'payload_format': 'columnar'})
+    mock_client = MagicMock()
+    mock_client.publish.return_value.rc = mqtt.MQTT_ERR_SUCCESS
+    
+    publisher = MQTTPublisher(config)
+    publisher.client = mock_client
+    publisher._connected = True
+    
+    assert publisher.publish(telemetry_message)
+    
+    payload = json.loads(mock_client.publish.call_args[0][1])
+    assert payload['device_id'] == "test-device"
+    assert payload['readings']['sensor_name'] == ["test_sensor"]
+    assert payload['readings']['value'] == [25.5]
+    assert payload['readings']['validation_status'] == ["valid"]
+
+
+def test_mqtt_publisher_publish_batch(mqtt_config, telemetry_message):
+    """Test publishing several messages in one MQTT payload"""
+    mock_client = MagicMock()
+    mock_client.publish.return_value.rc = mqtt.MQTT_ERR_SUCCESS
+    
+    publisher = MQTTPublisher(mqtt_config)
+    publisher.client = mock_client
+    publisher._connected = True
+    
+    assert publisher.publish_batch([telemetry_message, telemetry_message])
+    
+    mock_client.publish.assert_called_once()
+    topic, payload = mock_client.publish.call_args[0]
+    assert topic == "test/topic/telemetry"
+    batch = json.loads(payload)['batch']
+    assert len(batch) == 2
+    assert batch[0] == json.loads(telemetry_message.to_bytes())
+
+
+def test_mqtt_publisher_publish_batch_columnar(mqtt_config, telemetry_message):
+    """Test that batched messages use the configured payload format"""
+    config = mqtt_config.model_copy(update={'payload_format': 'columnar'})
+    mock_client = MagicMock()
+    mock_client.publish.return_value.rc = mqtt.MQTT_ERR_SUCCESS
+    
+    publisher = MQTTPublisher(config)
+    publisher.client = mock_client
+    publisher._connected = True
+    
+    assert publisher.publish_batch([telemetry_message, telemetry_message])
+    
+    batch = json.loads(mock_client.publish.call_args[0][1])['batch']
+    assert batch == [json.loads(telemetry_message.to_columnar_bytes())] * 2
+
+
+def test_mqtt_publisher_publish_queue_full(mqtt_config, telemetry_message):
+    """Test that a full outgoing queue is reported as backpressure"""
+    mock_client = MagicMock()
+    mock_client.publish.return_value.rc = mqtt.MQTT_ERR_QUEUE_SIZE
+    
+    publisher = MQTTPublisher(mqtt_config)
+    publisher.client = mock_client
+    publisher._connected = True
+    
+    assert not publisher.publish(telemetry_message)
+    assert not publisher._unacked
+
+
+def test_mqtt_publisher_flush(mqtt_config, telemetry_message):
+    """Test batched confirmation of QoS 1 publishes"""
+    acked, pending = MagicMock(rc=mqtt.MQTT_ERR_SUCCESS), MagicMock(rc=mqtt.MQTT_ERR_SUCCESS)
+    acked.is_published.return_value = True
+    pending.is_published.return_value = False
+    mock_client = MagicMock()
+    mock_client.publish.side_effect = [acked, pending]
+    
+    publisher = MQTTPublisher(mqtt_config)
+    publisher.client = mock_client
+    publisher._connected = True
+    publisher.publish(telemetry_message)
+    publisher.publish(telemetry_message)
+    
+    # The acknowledged message is pruned when the next one is tracked
+    assert list(publisher._unacked) == [pending]
+    assert not publisher.flush(timeout=0.01)
+    pending.wait_for_publish.assert_called_once()
+    
+    pending.is_published.return_value = True
+    assert publisher.flush(timeout=0.01)
+    assert not publisher._unacked
 
 
 @patch('paho.mqtt.client.Client')
@@ -127,6 +248,14 @@ def test_mqtt_publisher_publish_json(mock_client_class, mqtt_config):
     
     assert success
     mock_client.publish.assert_called_once()
+    
+    topic, payload = mock_client.publish.call_args[0]
+    assert topic == "test/topic/status"
+    assert json.loads(payload) == test_data
+    
+    # A repeat publish reuses the cached topic string
+    publisher.publish_json("status", test_data)
+    assert mock_client.publish.call_args[0][0] is topic
 
 
 def test_mqtt_on_connect_callback(mqtt_config):
@@ -139,6 +268,37 @@ def test_mqtt_on_connect_callback(mqtt_config):
     assert publisher._connected
 
 
+@patch('paho.mqtt.client.Client')
+def test_mqtt_attempt_connection_waits_for_connack(mock_client_class, mqtt_config):
+    """Test that connecting returns as soon as the broker acknowledges"""
+    mock_client = MagicMock()
+    mock_client_class.return_value = mock_client
+    publisher = MQTTPublisher(mqtt_config)
+    
+    # The network loop delivers CONNACK when it starts
+    mock_client.loop_start.side_effect = lambda: publisher._on_connect(None, None, None, 0)
+    
+    publisher._attempt_connection()
+    
+    assert publisher.is_connected
+    assert publisher._connect_event.is_set()
+
+
+@patch('paho.mqtt.client.Client')
+def test_mqtt_attempt_connection_refused(mock_client_class, mqtt_config):
+    """Test that a refused CONNACK fails the attempt without waiting for the timeout"""
+    mock_client = MagicMock()
+    mock_client_class.return_value = mock_client
+    publisher = MQTTPublisher(mqtt_config)
+    
+    mock_client.loop_start.side_effect = lambda: publisher._on_connect(None, None, None, 5)
+    
+    with pytest.raises(ConnectionError):
+        MQTTPublisher._attempt_connection.__wrapped__(publisher)
+    
+    assert not publisher.is_connected
+
+
 def test_mqtt_on_disconnect_callback(mqtt_config):
     """Test on_disconnect callback"""
     publisher = MQTTPublisher(mqtt_config)
@@ -165,3 +325,32 @@ def test_mqtt_connection_callbacks(mqtt_config):
     publisher._on_connect(None, None, None, 0)
     
     assert callback_called['value']
+
+
+def test_mqtt_on_socket_open_sets_nodelay(mqtt_config):
+    """Test that new sockets have Nagle's algorithm disabled"""
+    publisher = MQTTPublisher(mqtt_config)
+    mock_sock = MagicMock()
+    
+    publisher._on_socket_open(None, None, mock_sock)
+    
+    mock_sock.setsockopt.assert_called_once_with(
+        socket.IPPROTO_TCP, socket.TCP_NODELAY, 1
+    )
+
+
+def test_mqtt_configure_tls_builds_context_once(mqtt_config):
+    """Test that connection retries reuse one SSL context"""
+    config = mqtt_config.model_copy(update={'tls': TLSConfig(enabled=True)})
+    publisher = MQTTPublisher(config)
+    
+    contexts = []
+    for _ in range(3):
+        publisher.client = MagicMock()
+        publisher._configure_tls()
+        contexts.append(publisher.client.tls_set_context.call_args[0][0])
+    
+    assert contexts[0] is contexts[1] is contexts[2]
+    assert isinstance(publisher._ssl_context, ssl.SSLContext)
+    assert publisher._ssl_context.verify_mode == ssl.CERT_REQUIRED
+    assert publisher._ssl_context.minimum_version == ssl.TLSVersion.TLSv1_2
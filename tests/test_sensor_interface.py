@@ -41,6 +41,43 @@ def test_sensor_reading_to_dict():
     assert reading_dict['metadata']['source'] == "test"
 
 
+def test_sensor_reading_has_no_instance_dict():
+    """Test that sensor readings are slotted"""
+    reading = SensorReading("test_sensor", 25.5, "celsius")
+    
+    assert not hasattr(reading, '__dict__')
+
+
+def test_sensor_reading_default_metadata_not_shared():
+    """Test that each reading gets its own default metadata dict"""
+    first = SensorReading("test_sensor", 25.5, "celsius")
+    second = SensorReading("test_sensor", 26.0, "celsius")
+    
+    first.metadata["source"] = "test"
+    
+    assert second.metadata == {}
+
+
+def test_sensor_reading_explicit_none_defaults():
+    """Test that explicit None timestamp and metadata fall back to defaults"""
+    reading = SensorReading("test_sensor", 25.5, "celsius", None, None)
+    
+    assert isinstance(reading.timestamp, datetime)
+    assert reading.metadata == {}
+    assert reading.to_dict()['timestamp'] == reading.timestamp.isoformat()
+
+
+def test_sensor_reading_compares_by_identity():
+    """Test that readings keep identity equality and stay hashable"""
+    timestamp = datetime.utcnow()
+    first = SensorReading("test_sensor", 25.5, "celsius", timestamp)
+    second = SensorReading("test_sensor", 25.5, "celsius", timestamp)
+    
+    assert first != second
+    assert first == first
+    assert len({first, second}) == 2
+
+
 def test_sensor_reading_repr():
     """Test sensor reading string representation"""
     reading = SensorReading(
@@ -2,8 +2,13 @@
 Unit tests for telemetry validation and normalization
 """
 
+import json
+import threading
+import uuid
 import pytest
 from datetime import datetime
+from types import MappingProxyType
+from unittest.mock import patch
 from src.telemetry import (
     DataValidator,
     TelemetryNormalizer,
@@ -82,6 +87,53 @@ def test_validator_out_of_range_low(validation_rules):
     assert validated.validation_status == "out_of_range"
 
 
+def test_validator_batch(validation_rules):
+    """Test batch validation matches per-reading validation"""
+    validator = DataValidator(validation_rules)
+    
+    readings = [
+        SensorReading("temperature_sensor", 25.5, "celsius"),
+        SensorReading("temperature_sensor", 100.0, "celsius"),
+        SensorReading("humidity_sensor", -5.0, "percent"),
+        SensorReading("unknown_sensor", 1e9, "raw")
+    ]
+    
+    validated = validator.validate_batch(readings, "test-device-001")
+    
+    assert [v.validation_status for v in validated] == [
+        "valid", "out_of_range", "out_of_range", "valid"
+    ]
+    assert validator.out_of_range_count == 2
+    assert validated == [
+        validator.validate(reading, "test-device-001") for reading in readings
+    ]
+
+
+def test_validator_caches_rules_per_sensor(validation_rules):
+    """Test that sensor rules are resolved once per sensor name"""
+    validator = DataValidator(validation_rules)
+    
+    with patch.object(validator, '_get_rules', wraps=validator._get_rules) as get_rules:
+        for value in (20.0, 21.0, 200.0):
+            validator.validate(SensorReading("Barometric_Pressure", value, "hPa"))
+    
+    get_rules.assert_called_once_with("pressure")
+    assert validator._extract_sensor_type("light_level") == "light"
+    assert validator._extract_sensor_type("vibration") == "vibration"
+
+
+def test_validator_one_sided_bounds():
+    """Test rules that only set a maximum"""
+    validator = DataValidator(ValidationRules(light={'max': 1000}))
+    
+    assert validator.validate(
+        SensorReading("light_sensor", -5.0, "lux")
+    ).validation_status == "valid"
+    assert validator.validate(
+        SensorReading("light_sensor", 2000.0, "lux")
+    ).validation_status == "out_of_range"
+
+
 def test_normalizer_single_reading(telemetry_config):
     """Test normalizing a single reading"""
     normalizer = TelemetryNormalizer(telemetry_config)
@@ -101,6 +153,74 @@ def test_normalizer_single_reading(telemetry_config):
     assert message.readings[0].device_id == "test-device-001"
 
 
+def test_normalizer_overrides_foreign_device_id(telemetry_config):
+    """Test that the configured device ID replaces one already on the reading"""
+    normalizer = TelemetryNormalizer(telemetry_config)
+    
+    reading = ValidatedReading(
+        sensor_name="temperature_sensor",
+        value=25.5,
+        unit="celsius",
+        timestamp=datetime.utcnow(),
+        device_id="other-device"
+    )
+    
+    message = normalizer.add_reading(reading)
+    
+    assert message.readings[0].device_id == "test-device-001"
+
+
+def test_telemetry_message_to_bytes(telemetry_config):
+    """Test that message bytes are the JSON form of to_dict"""
+    normalizer = TelemetryNormalizer(telemetry_config)
+    reading = ValidatedReading(
+        sensor_name="temperature_sensor",
+        value=25.5,
+        unit="celsius",
+        timestamp=datetime(2024, 1, 1, 12, 0, 0, 123),
+        metadata=MappingProxyType({"slave_id": 1})
+    )
+    
+    message = normalizer.add_reading(reading, timestamp=datetime(2024, 1, 1, 12, 0, 5))
+    payload = json.loads(message.to_bytes())
+    
+    assert payload == message.to_dict()
+    assert payload['timestamp'] == "2024-01-01T12:00:05"
+    assert payload['readings'][0]['timestamp'] == "2024-01-01T12:00:00.000123"
+    assert payload['readings'][0]['validation_status'] == "valid"
+    assert not hasattr(message, '__dict__')
+
+
+def test_telemetry_message_to_columnar_bytes(telemetry_config):
+    """Test that columnar bytes transpose back to the row readings"""
+    normalizer = TelemetryNormalizer(telemetry_config)
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+    message = normalizer._create_message([
+        ValidatedReading(
+            sensor_name=f"temp{i}",
+            value=20.0 + i,
+            unit="celsius",
+            timestamp=timestamp,
+            device_id="test-device-001",
+            metadata={"slave_id": i}
+        )
+        for i in range(3)
+    ], timestamp)
+    
+    payload = json.loads(message.to_columnar_bytes())
+    expected = message.to_dict()
+    
+    # Reading device IDs are dropped since they repeat the message's
+    columns = payload.pop('readings')
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    expected_rows = expected.pop('readings')
+    for row in expected_rows:
+        del row['device_id']
+    
+    assert payload == expected
+    assert rows == expected_rows
+
+
 def test_normalizer_batch_mode():
     """Test normalizing with batching enabled"""
     config = TelemetryConfig(
@@ -146,6 +266,68 @@ def test_normalizer_batch_mode():
     assert len(message.readings) == 3
 
 
+def test_normalizer_batch_concurrent_producers():
+    """Test that readings added from several threads land in exactly one message"""
+    config = TelemetryConfig(batch_enabled=True, batch_size=10, device_id="test-device-001")
+    normalizer = TelemetryNormalizer(config)
+    messages = []
+    
+    def produce(worker):
+        for i in range(250):
+            reading = ValidatedReading(
+                sensor_name=f"sensor{worker}_{i}",
+                value=float(i),
+                unit="celsius",
+                timestamp=datetime.utcnow()
+            )
+            message = normalizer.add_reading(reading)
+            if message is not None:
+                messages.append(message)
+    
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert normalizer.flush() is None
+    assert all(len(message.readings) == 10 for message in messages)
+    names = [r.sensor_name for message in messages for r in message.readings]
+    assert len(names) == 1000
+    assert len(set(names)) == 1000
+
+
+def test_telemetry_processor_batch_spans_polls_until_due(validation_rules):
+    """Test that batch_max_latency holds readings across polls"""
+    config = TelemetryConfig(
+        batch_enabled=True,
+        batch_size=10,
+        batch_max_latency=5.0,
+        device_id="test-device-001"
+    )
+    processor = TelemetryProcessor(validation_rules, config)
+    poll = [SensorReading("temperature_sensor", 25.5, "celsius")]
+    
+    with patch('src.telemetry.time.monotonic', side_effect=[100.0, 101.0, 105.0]):
+        assert processor.process_readings(poll) == []
+        messages = processor.process_readings(poll)
+    
+    assert len(messages) == 1
+    assert len(messages[0].readings) == 2
+
+
+def test_normalizer_message_ids_unique(telemetry_config):
+    """Test that message IDs are unique, canonical version-4 UUIDs"""
+    normalizer = TelemetryNormalizer(telemetry_config)
+    
+    ids = [normalizer._generate_message_id() for _ in range(200)]
+    
+    assert len(set(ids)) == len(ids)
+    assert all(uuid.UUID(i).version == 4 for i in ids)
+    assert all(uuid.UUID(i).variant == uuid.RFC_4122 for i in ids)
+    assert all(str(uuid.UUID(i)) == i for i in ids)
+
+
 def test_telemetry_processor(validation_rules, telemetry_config):
     """Test complete telemetry processing"""
     processor = TelemetryProcessor(validation_rules, telemetry_config)
@@ -161,6 +343,18 @@ def test_telemetry_processor(validation_rules, telemetry_config):
     assert message is not None
     assert len(message.readings) == 1
     assert message.readings[0].validation_status == "valid"
+    assert message.readings[0].device_id == "test-device-001"
+
+
+def test_telemetry_processor_without_device_id(validation_rules):
+    """Test that readings carry no device ID when it is not included"""
+    config = TelemetryConfig(include_device_id=False, device_id="test-device-001")
+    processor = TelemetryProcessor(validation_rules, config)
+    
+    message = processor.process_reading(SensorReading("temperature_sensor", 25.5, "celsius"))
+    
+    assert message.readings[0].device_id is None
+    assert message.device_id == "test-device-001"
 
 
 def test_telemetry_processor_multiple_readings(validation_rules, telemetry_config):
@@ -177,3 +371,40 @@ def test_telemetry_processor_multiple_readings(validation_rules, telemetry_confi
     
     # In non-batch mode, should get 3 messages plus possibly a flush
     assert len(messages) >= 3
+
+
+def test_telemetry_processor_batches_poll_cycle(validation_rules):
+    """Test that one poll cycle produces a single batched message"""
+    config = TelemetryConfig(
+        batch_enabled=True,
+        batch_size=10,
+        device_id="test-device-001"
+    )
+    processor = TelemetryProcessor(validation_rules, config)
+    
+    readings = [
+        SensorReading("temperature_sensor", 25.5, "celsius"),
+        SensorReading("humidity_sensor", 60.0, "percent"),
+        SensorReading("pressure_sensor", 1013.0, "hPa")
+    ]
+    
+    messages = processor.process_readings(readings)
+    
+    assert len(messages) == 1
+    assert len(messages[0].readings) == 3
+
+
+def test_telemetry_processor_shared_timestamp(validation_rules, telemetry_config):
+    """Test that every message from one call shares the poll timestamp"""
+    processor = TelemetryProcessor(validation_rules, telemetry_config)
+    poll_time = datetime(2024, 1, 1, 12, 0, 0)
+    
+    readings = [
+        SensorReading("temperature_sensor", 25.5, "celsius"),
+        SensorReading("humidity_sensor", 60.0, "percent")
+    ]
+    
+    messages = processor.process_readings(readings, timestamp=poll_time)
+    
+    assert len(messages) == 2
+    assert all(message.timestamp == poll_time for message in messages)